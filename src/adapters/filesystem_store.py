@@ -10,6 +10,10 @@ _DERIVED_DIR = "derived"
 _MANIFEST_NAME = "manifest.json"
 
 
+def _is_safe_relpath(relpath: str) -> bool:
+    return bool(relpath) and not relpath.startswith("/") and ".." not in relpath.split("/")
+
+
 def _is_within_root(path: Path, root: Path) -> bool:
     try:
         path.resolve().relative_to(root.resolve())
@@ -39,11 +43,16 @@ class SessionStore:
     def derived_dir(self, session_id: SessionId | str) -> Path:
         return self.session_root(session_id) / _DERIVED_DIR
 
+    def derived_path(self, session_id: SessionId | str, relpath: str) -> Path:
+        if not _is_safe_relpath(relpath):
+            raise ValueError("relpath must be a safe relative path")
+        return self.data_dir / str(coerce_session_id(session_id)) / _DERIVED_DIR / relpath
+
     def manifest_path(self, session_id: SessionId | str) -> Path:
         return self.session_root(session_id) / _MANIFEST_NAME
 
     def resolve_relpath(self, session_id: SessionId | str, relpath: str) -> Path:
-        if not relpath or relpath.startswith("/") or ".." in relpath.split("/"):
+        if not _is_safe_relpath(relpath):
             raise ValueError("relpath must be a safe relative path")
 
         root = self.session_root(session_id)
@@ -7,10 +7,10 @@ from contextlib import contextmanager
 from dataclasses import replace
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Mapping
+from typing import Any, Iterable, Mapping
 
 from adapters.filesystem_store import SessionStore
-from domain.models import ItemKind, Manifest, ManifestItem, TranscriptFormat
+from domain.models import ItemKind, ItemSpec, Manifest, ManifestItem, TranscriptFormat
 from domain.time_utils import parse_iso_timestamp
 from domain.types import ItemId, SessionId, coerce_session_id
 from ports.clock import ClockPort, SystemClock
@@ -103,30 +103,41 @@ class ManifestRepository:
         pinned: bool,
         ttl_seconds: int,
     ) -> ManifestItem:
+        spec = ItemSpec(kind=kind, fmt=fmt, relpath=relpath, ttl_seconds=ttl_seconds, pinned=pinned)
+        return self.add_items(session_id, [spec])[0]
+
+    def add_items(
+        self, session_id: SessionId | str, specs: Iterable[ItemSpec]
+    ) -> list[ManifestItem]:
         sid = coerce_session_id(session_id)
-        manifest = self.load(sid)
-        item_id = ItemId(f"tr_{uuid.uuid4().hex}")
         now = self._clock.now()
         created_at = _now_iso(now)
-        expires_at = None if pinned else _expires_at(ttl_seconds, now=now)
-        target = self._store.resolve_relpath(sid, relpath)
-        size = target.stat().st_size
-
-        format_value = fmt.value if isinstance(fmt, TranscriptFormat) else str(fmt)
-        item = ManifestItem(
-            id=item_id,
-            kind=kind,
-            format=format_value,
-            relpath=relpath,
-            size=size,
-            created_at=created_at,
-            expires_at=expires_at,
-            pinned=pinned,
-        )
-        updated = replace(manifest, items=[*manifest.items, item])
+        items: list[ManifestItem] = []
+        for spec in specs:
+            target = self._store.resolve_relpath(sid, spec.relpath)
+            size = target.stat().st_size
+            fmt = spec.fmt
+            format_value = fmt.value if isinstance(fmt, TranscriptFormat) else str(fmt)
+            items.append(
+                ManifestItem(
+                    id=ItemId(f"tr_{uuid.uuid4().hex}"),
+                    kind=spec.kind,
+                    format=format_value,
+                    relpath=spec.relpath,
+                    size=size,
+                    created_at=created_at,
+                    expires_at=None if spec.pinned else _expires_at(spec.ttl_seconds, now=now),
+                    pinned=spec.pinned,
+                )
+            )
+
+        if not items:
+            return items
+        manifest = self.load(sid)
+        updated = replace(manifest, items=[*manifest.items, *items])
         self.save(updated)
         self.cleanup_session(sid)
-        return item
+        return items
 
     def list_items(
         self,
@@ -1,18 +1,63 @@
 from __future__ import annotations
 
 import json
+import os
 import subprocess
 import tempfile
+import threading
 import time
+from collections import OrderedDict
 from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Callable, Iterator
+from typing import Any, Callable, Iterator, Sequence
 
 from config import AppConfig
-from domain.errors import ExternalCommandError
+from domain.errors import OUTPUT_TAIL_CHARS, ExternalCommandError
+from domain.urls import INVALID_YOUTUBE_URL_MESSAGE, is_youtube_url
 from logging_utils import log_debug, log_error, log_warning
 
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+    try:
+        import simdjson as _simdjson
+    except ImportError:
+        _simdjson = None
+else:
+    _simdjson = None
+
+
+def _select_loads(orjson_mod: Any, simdjson_mod: Any) -> Callable[[str | bytes], Any]:
+    if orjson_mod is not None:
+        return orjson_mod.loads
+    if simdjson_mod is None:
+        return json.loads
+
+    # A simdjson Parser owns its tape buffers; keep one per thread and
+    # materialize plain Python objects so the parser can be reused.
+    local = threading.local()
+
+    def loads(data: str | bytes) -> Any:
+        parser = getattr(local, "parser", None)
+        if parser is None:
+            parser = local.parser = simdjson_mod.Parser()
+        return parser.parse(data, recursive=True)
+
+    return loads
+
+
+_loads = _select_loads(_orjson, _simdjson)
+
+_INFO_CACHE_MAX_ENTRIES = 256
+_NEGATIVE_CACHE_TTL_SEC = 30
+# A UTF-8 character is at most 4 bytes, so this many bytes always covers the
+# characters ExternalCommandError keeps.
+_OUTPUT_TAIL_BYTES = 4 * OUTPUT_TAIL_CHARS
+
 
 @dataclass(frozen=True)
 class YtDlpSubtitles:
@@ -21,8 +66,10 @@ class YtDlpSubtitles:
     picked_file: str
 
 
-def _build_info_command(config: AppConfig, url: str) -> list[str]:
-    return [
+# AppConfig is frozen and hashable, so clients sharing a config share these tuples.
+@lru_cache(maxsize=32)
+def _info_argv_prefix(config: AppConfig) -> tuple[str, ...]:
+    return (
         config.ytdlp_bin,
         "--remote-components",
         config.remote_ejs,
@@ -32,12 +79,13 @@ def _build_info_command(config: AppConfig, url: str) -> list[str]:
         "--no-progress",
         "--no-playlist",
         "--dump-json",
-        url,
-    ]
+    )
 
 
-def _build_subs_command(config: AppConfig, url: str, workdir: Path) -> list[str]:
-    return [
+@lru_cache(maxsize=32)
+def _subs_argv_prefix(config: AppConfig) -> tuple[str, ...]:
+    # The workdir and URL are appended after "--paths".
+    return (
         config.ytdlp_bin,
         "--remote-components",
         config.remote_ejs,
@@ -49,9 +97,44 @@ def _build_subs_command(config: AppConfig, url: str, workdir: Path) -> list[str]
         "--skip-download",
         "--no-progress",
         "--paths",
-        str(workdir),
-        url,
-    ]
+    )
+
+
+def _json_lines_from_end(output: bytes) -> Iterator[bytes]:
+    # yt-dlp prints one JSON document per URL on lines starting with "{"; walk
+    # backwards over such lines instead of splitting the whole output.
+    end = len(output)
+    while end > 0:
+        idx = output.rfind(b"\n{", 0, end)
+        start = idx + 1 if idx >= 0 else (0 if output.startswith(b"{") else -1)
+        if start < 0:
+            return
+        line_end = output.find(b"\n", start)
+        line = output[start : line_end if line_end >= 0 else len(output)].rstrip()
+        if line.endswith(b"}"):
+            yield line
+        end = idx
+
+
+def _decode(output: bytes) -> str:
+    # Only the tail survives in ExternalCommandError, so skip decoding the rest.
+    return output[-_OUTPUT_TAIL_BYTES:].decode("utf-8", errors="replace")
+
+
+def _require_youtube_url(url: str) -> None:
+    # Reject obviously bad input before paying for a yt-dlp process.
+    if not is_youtube_url(url):
+        log_warning("invalid_youtube_url", url=url)
+        raise ValueError(INVALID_YOUTUBE_URL_MESSAGE)
+
+
+def _pick_vtt(workdir: str) -> str | None:
+    # Prefer English subtitles; within a group take the last name in sort order.
+    with os.scandir(workdir) as entries:
+        names = [entry.name for entry in entries if entry.name.endswith(".vtt")]
+    english = [name for name in names if name.endswith(".en.vtt")]
+    candidates = english or names
+    return max(candidates) if candidates else None
 
 
 @contextmanager
@@ -65,70 +148,217 @@ class YtDlpClient:
         self,
         config: AppConfig,
         *,
-        runner: Callable[..., subprocess.CompletedProcess[str]] | None = None,
+        runner: Callable[..., subprocess.CompletedProcess[Any]] | None = None,
         temp_dir_factory: Callable[[str], Iterator[Path]] | None = None,
         cache_ttl_sec: int = 0,
         time_provider: Callable[[], float] | None = None,
+        event_factory: Callable[[], threading.Event] | None = None,
     ) -> None:
         self._config = config
+        self._info_argv_prefix = _info_argv_prefix(config)
+        self._subs_argv_prefix = _subs_argv_prefix(config)
         self._runner = runner or subprocess.run
         self._temp_dir_factory = temp_dir_factory or _temp_dir
         self._cache_ttl_sec = cache_ttl_sec
         self._time_provider = time_provider or time.time
-        self._info_cache: dict[str, tuple[float, dict]] = {}
+        # url -> (deadline, payload), least recently used first.
+        self._info_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        # url -> (deadline, message, returncode, output) for recent failures, oldest first.
+        self._neg_ttl_sec = _NEGATIVE_CACHE_TTL_SEC
+        self._info_negative_cache: OrderedDict[
+            str, tuple[float, str, int | None, str | None]
+        ] = OrderedDict()
+        self._event_factory = event_factory or threading.Event
+        self._inflight: dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
 
     def get_info(self, url: str) -> dict:
-        if self._cache_ttl_sec > 0:
-            cached = self._info_cache.get(url)
-            if cached:
-                ts, payload = cached
-                if self._time_provider() - ts <= self._cache_ttl_sec:
-                    log_debug("ytdlp_info_cache_hit", url=url)
-                    return payload
-
-        log_debug("ytdlp_info_fetch", url=url)
-        cmd = _build_info_command(self._config, url)
+        return self.get_info_many([url])[0]
+
+    def get_info_many(self, urls: Sequence[str]) -> list[dict]:
+        if not urls:
+            return []
+        for url in urls:
+            _require_youtube_url(url)
+        unique = list(dict.fromkeys(urls))
+        if self._cache_ttl_sec <= 0:
+            fetched = dict(zip(unique, self._fetch_infos(unique)))
+            return [fetched[url] for url in urls]
+
+        found: dict[str, dict] = {}
+        for url in unique:
+            cached = self._cached_info(url)
+            if cached is not None:
+                found[url] = cached
+                continue
+            failure = self._cached_failure(url)
+            if failure is not None:
+                raise failure
+
+        # Single-flight: a URL already being fetched by another caller is waited
+        # on; the rest are fetched here in one yt-dlp run. URLs whose leader
+        # failed go round again, so retries are coalesced and cached too.
+        pending = [url for url in unique if url not in found]
+        while pending:
+            led: dict[str, threading.Event] = {}
+            waiting: dict[str, threading.Event] = {}
+            failure = None
+            with self._lock:
+                # A leader may have stored a payload or a failure since the
+                # misses above; check both before registering anything.
+                for url in pending:
+                    cached = self._cached_info_locked(url)
+                    if cached is not None:
+                        found[url] = cached
+                        continue
+                    failure = self._cached_failure_locked(url)
+                    if failure is not None:
+                        break
+                else:
+                    for url in pending:
+                        if url in found:
+                            continue
+                        event = self._inflight.get(url)
+                        if event is None:
+                            led[url] = self._inflight[url] = self._event_factory()
+                        else:
+                            waiting[url] = event
+            if failure is not None:
+                log_debug("ytdlp_info_negative_cache_hit", url=url)
+                raise failure
+
+            if led:
+                try:
+                    for url, payload in zip(led, self._fetch_infos(list(led))):
+                        self._store_info(url, payload)
+                        log_debug("ytdlp_info_cache_store", url=url, ttl=self._cache_ttl_sec)
+                        found[url] = payload
+                except ExternalCommandError as exc:
+                    # A failed batch does not say which URL broke it, so only
+                    # single-URL failures are remembered.
+                    if len(led) == 1:
+                        self._store_failure(next(iter(led)), exc)
+                    raise
+                finally:
+                    with self._lock:
+                        for url in led:
+                            self._inflight.pop(url, None)
+                    for event in led.values():
+                        event.set()
+
+            pending = []
+            for url, event in waiting.items():
+                event.wait(timeout=self._config.timeout_sec)
+                cached = self._cached_info(url)
+                if cached is not None:
+                    found[url] = cached
+                    continue
+                failure = self._cached_failure(url)
+                if failure is not None:
+                    raise failure
+                pending.append(url)
+
+        return [found[url] for url in urls]
+
+    def _store_info(self, url: str, payload: dict) -> None:
+        now = self._time_provider()
+        with self._lock:
+            cache = self._info_cache
+            # Entries nobody reads drift to the cold end; drop the expired ones there.
+            while cache and next(iter(cache.values()))[0] < now:
+                cache.popitem(last=False)
+            cache[url] = (now + self._cache_ttl_sec, payload)
+            cache.move_to_end(url)
+            if len(cache) > _INFO_CACHE_MAX_ENTRIES:
+                cache.popitem(last=False)
+
+    def _cached_info(self, url: str) -> dict | None:
+        with self._lock:
+            cached = self._cached_info_locked(url)
+        if cached is not None:
+            log_debug("ytdlp_info_cache_hit", url=url)
+        return cached
+
+    def _cached_info_locked(self, url: str) -> dict | None:
+        # Caller must hold self._lock.
+        cached = self._info_cache.get(url)
+        if not cached or self._time_provider() > cached[0]:
+            return None
+        self._info_cache.move_to_end(url)
+        return cached[1]
+
+    def _store_failure(self, url: str, exc: ExternalCommandError) -> None:
+        now = self._time_provider()
+        with self._lock:
+            cache = self._info_negative_cache
+            # Every entry has the same TTL, so the oldest entries expire first.
+            while cache and next(iter(cache.values()))[0] < now:
+                cache.popitem(last=False)
+            cache.pop(url, None)
+            # Keep plain data: a stored exception would pin its traceback frames
+            # and grow the traceback every time it is re-raised.
+            cache[url] = (now + self._neg_ttl_sec, exc.message, exc.returncode, exc.output)
+            if len(cache) > _INFO_CACHE_MAX_ENTRIES:
+                cache.popitem(last=False)
+
+    def _cached_failure(self, url: str) -> ExternalCommandError | None:
+        with self._lock:
+            failure = self._cached_failure_locked(url)
+        if failure is not None:
+            log_debug("ytdlp_info_negative_cache_hit", url=url)
+        return failure
+
+    def _cached_failure_locked(self, url: str) -> ExternalCommandError | None:
+        # Caller must hold self._lock.
+        cached = self._info_negative_cache.get(url)
+        if not cached or self._time_provider() > cached[0]:
+            return None
+        _, message, returncode, output = cached
+        return ExternalCommandError(message, returncode=returncode, output=output)
+
+    def _fetch_infos(self, urls: list[str]) -> list[dict]:
+        log_debug("ytdlp_info_fetch", urls=urls)
+        cmd = [*self._info_argv_prefix, *urls]
+        # Keep stdout as bytes: the JSON parsers take bytes directly, and the
+        # output is only decoded when it ends up in an error message.
         proc = self._runner(
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
+            text=False,
             timeout=self._config.timeout_sec,
         )
+        stdout = proc.stdout
+        if isinstance(stdout, str):
+            stdout = stdout.encode("utf-8")
 
         if proc.returncode != 0:
-            log_error("ytdlp_info_failed", url=url, code=proc.returncode)
+            log_error("ytdlp_info_failed", urls=urls, code=proc.returncode)
             raise ExternalCommandError(
-                f"yt-dlp metadata failed (code {proc.returncode}). Output:\n{proc.stdout}"
+                "yt-dlp metadata failed", returncode=proc.returncode, output=_decode(stdout)
             )
 
-        lines = [line for line in proc.stdout.splitlines() if line.strip()]
-        json_line = None
-        for line in reversed(lines):
-            if line.lstrip().startswith("{") and line.rstrip().endswith("}"):
-                json_line = line
-                break
-
-        if json_line is None:
-            log_error("ytdlp_info_missing_json", url=url)
-            raise ExternalCommandError(f"yt-dlp metadata output missing JSON. Output:\n{proc.stdout}")
+        # The last len(urls) JSON lines are the documents, in URL order.
+        json_lines = list(islice(_json_lines_from_end(stdout), len(urls)))
+        if len(json_lines) < len(urls):
+            log_error("ytdlp_info_missing_json", urls=urls)
+            raise ExternalCommandError(
+                "yt-dlp metadata output missing JSON", output=_decode(stdout)
+            )
+        json_lines.reverse()
 
         try:
-            payload = json.loads(json_line)
-        except json.JSONDecodeError as exc:
-            log_error("ytdlp_info_parse_failed", url=url)
+            return [_loads(line) for line in json_lines]
+        except ValueError as exc:
+            log_error("ytdlp_info_parse_failed", urls=urls)
             raise ExternalCommandError(f"Failed to parse yt-dlp metadata JSON: {exc}") from exc
 
-        if self._cache_ttl_sec > 0:
-            self._info_cache[url] = (self._time_provider(), payload)
-            log_debug("ytdlp_info_cache_store", url=url, ttl=self._cache_ttl_sec)
-
-        return payload
-
     def get_subtitles(self, url: str) -> YtDlpSubtitles:
-        with self._temp_dir_factory("yt_transcribe_") as workdir:
-            log_debug("ytdlp_subtitles_fetch", url=url, dir=str(workdir))
-            cmd = _build_subs_command(self._config, url, workdir)
+        _require_youtube_url(url)
+        with self._temp_dir_factory("yt_transcribe_") as tmp:
+            workdir = os.fspath(tmp)
+            log_debug("ytdlp_subtitles_fetch", url=url, dir=workdir)
+            cmd = [*self._subs_argv_prefix, workdir, url]
             proc = self._runner(
                 cmd,
                 cwd=workdir,
@@ -138,23 +368,21 @@ class YtDlpClient:
                 timeout=self._config.timeout_sec,
             )
 
-            vtts = sorted(workdir.glob("*.en.vtt"))
-            if not vtts:
-                vtts = sorted(workdir.glob("*.vtt"))
+            picked = _pick_vtt(workdir)
 
             if proc.returncode != 0:
-                if not vtts:
+                if picked is None:
                     log_error("ytdlp_subtitles_failed", url=url, code=proc.returncode)
                     raise ExternalCommandError(
-                        f"yt-dlp failed (code {proc.returncode}). Output:\n{proc.stdout}"
+                        "yt-dlp failed", returncode=proc.returncode, output=proc.stdout
                     )
                 log_warning("ytdlp_subtitles_partial_success", url=url, code=proc.returncode)
 
-            if not vtts:
+            if picked is None:
                 log_error("ytdlp_subtitles_missing", url=url)
-                raise ExternalCommandError(f"No subtitle files were produced. yt-dlp output:\n{proc.stdout}")
+                raise ExternalCommandError("No subtitle files were produced", output=proc.stdout)
 
-            vtt_path = vtts[-1]
-            log_debug("ytdlp_subtitles_selected", url=url, file=vtt_path.name)
-            vtt_text = vtt_path.read_text(encoding="utf-8", errors="replace")
-            return YtDlpSubtitles(vtt_text=vtt_text, stdout=proc.stdout, picked_file=vtt_path.name)
+            log_debug("ytdlp_subtitles_selected", url=url, file=picked)
+            with open(os.path.join(workdir, picked), encoding="utf-8", errors="replace") as handle:
+                vtt_text = handle.read()
+            return YtDlpSubtitles(vtt_text=vtt_text, stdout=proc.stdout, picked_file=picked)
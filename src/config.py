@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Mapping
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AppConfig:
     ytdlp_bin: str
     player_client: str
@@ -26,21 +27,47 @@ class AppConfig:
     def from_env(cls, env: Mapping[str, str] | None = None) -> "AppConfig":
         if env is None:
             env = os.environ
+        # Only the keys we read take part in the cache key, so unrelated
+        # environment churn does not defeat the cache.
+        return _config_from_values(cls, tuple(env.get(key) for key in _ENV_KEYS))
 
-        default_ttl_raw = env.get("TRANSCRIPT_TTL_SECONDS") or env.get("DEFAULT_TTL_SEC") or "3600"
-
-        return cls(
-            ytdlp_bin=env.get("YTDLP_BIN", "yt-dlp"),
-            player_client=env.get("YTDLP_PLAYER_CLIENT", "web_safari"),
-            remote_ejs=env.get("YTDLP_REMOTE_EJS", "ejs:github"),
-            sub_lang=env.get("YTDLP_SUB_LANG", "en.*"),
-            timeout_sec=int(env.get("YTDLP_TIMEOUT_SEC", "180")),
-            auto_text_max_bytes=int(env.get("AUTO_TEXT_MAX_BYTES", "200000")),
-            default_ttl_sec=int(default_ttl_raw),
-            inline_text_max_bytes=int(env.get("INLINE_TEXT_MAX_BYTES", "20000")),
-            info_cache_ttl_sec=int(env.get("YTDLP_INFO_CACHE_TTL_SEC", "300")),
-            max_session_items=int(env.get("MAX_SESSION_ITEMS", "0")),
-            max_session_bytes=int(env.get("MAX_SESSION_BYTES", "0")),
-            default_session_id=env.get("DEFAULT_SESSION_ID", ""),
-            data_dir=Path(env.get("DATA_DIR", "/data")),
-        )
+
+_ENV_KEYS = (
+    "YTDLP_BIN",
+    "YTDLP_PLAYER_CLIENT",
+    "YTDLP_REMOTE_EJS",
+    "YTDLP_SUB_LANG",
+    "YTDLP_TIMEOUT_SEC",
+    "AUTO_TEXT_MAX_BYTES",
+    "TRANSCRIPT_TTL_SECONDS",
+    "DEFAULT_TTL_SEC",
+    "INLINE_TEXT_MAX_BYTES",
+    "YTDLP_INFO_CACHE_TTL_SEC",
+    "MAX_SESSION_ITEMS",
+    "MAX_SESSION_BYTES",
+    "DEFAULT_SESSION_ID",
+    "DATA_DIR",
+)
+
+
+@lru_cache(maxsize=32)
+def _config_from_values(cls: type[AppConfig], values: tuple[str | None, ...]) -> AppConfig:
+    env = {key: value for key, value in zip(_ENV_KEYS, values) if value is not None}
+
+    default_ttl_raw = env.get("TRANSCRIPT_TTL_SECONDS") or env.get("DEFAULT_TTL_SEC") or "3600"
+
+    return cls(
+        ytdlp_bin=env.get("YTDLP_BIN", "yt-dlp"),
+        player_client=env.get("YTDLP_PLAYER_CLIENT", "web_safari"),
+        remote_ejs=env.get("YTDLP_REMOTE_EJS", "ejs:github"),
+        sub_lang=env.get("YTDLP_SUB_LANG", "en.*"),
+        timeout_sec=int(env.get("YTDLP_TIMEOUT_SEC", "180")),
+        auto_text_max_bytes=int(env.get("AUTO_TEXT_MAX_BYTES", "200000")),
+        default_ttl_sec=int(default_ttl_raw),
+        inline_text_max_bytes=int(env.get("INLINE_TEXT_MAX_BYTES", "20000")),
+        info_cache_ttl_sec=int(env.get("YTDLP_INFO_CACHE_TTL_SEC", "300")),
+        max_session_items=int(env.get("MAX_SESSION_ITEMS", "0")),
+        max_session_bytes=int(env.get("MAX_SESSION_BYTES", "0")),
+        default_session_id=env.get("DEFAULT_SESSION_ID", ""),
+        data_dir=Path(env.get("DATA_DIR", "/data")),
+    )
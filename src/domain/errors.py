@@ -1,3 +1,6 @@
+from __future__ import annotations
+
+
 class AppError(Exception):
     """Base error for application/domain failures."""
 
@@ -18,5 +21,25 @@ class ExpiredItemError(ValueError, AppError):
     pass
 
 
+OUTPUT_TAIL_CHARS = 4096
+
+
 class ExternalCommandError(RuntimeError, AppError):
-    pass
+    """Failure of an external command; the message is rendered on demand."""
+
+    def __init__(
+        self, message: str, *, returncode: int | None = None, output: str | None = None
+    ) -> None:
+        super().__init__(message)
+        self.message = message
+        self.returncode = returncode
+        # Keep only the tail so verbose command output is not retained.
+        self.output = output[-OUTPUT_TAIL_CHARS:] if output else output
+
+    def __str__(self) -> str:
+        text = self.message
+        if self.returncode is not None:
+            text = f"{text} (code {self.returncode})"
+        if self.output is not None:
+            text = f"{text}. Output:\n{self.output}"
+        return text
@@ -58,6 +58,15 @@ class ManifestItem:
         )
 
 
+@dataclass(frozen=True)
+class ItemSpec:
+    kind: ItemKind
+    fmt: TranscriptFormat | str
+    relpath: str
+    ttl_seconds: int
+    pinned: bool = False
+
+
 @dataclass(frozen=True)
 class Manifest:
     session_id: SessionId
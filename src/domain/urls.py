@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+import re
+
+INVALID_YOUTUBE_URL_MESSAGE = (
+    "Please provide a valid YouTube video URL (youtube.com/watch?v=... or youtu.be/...)."
+)
+
+_YOUTUBE_URL_RE = re.compile(r"^https?://(?:(?:www\.)?youtube\.com/watch\?v=|youtu\.be/)", re.ASCII)
+
+
+def is_youtube_url(url: str) -> bool:
+    return _YOUTUBE_URL_RE.match(url) is not None
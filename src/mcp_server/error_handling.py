@@ -4,6 +4,7 @@ from functools import wraps
 from typing import Any, Callable, TypeVar
 
 from domain.errors import (
+    AppError,
     ExpiredItemError,
     ExternalCommandError,
     InvalidItemId,
@@ -14,6 +15,45 @@ from logging_utils import log_error, log_warning, request_context
 
 F = TypeVar("F", bound=Callable[..., Any])
 
+# domain error -> (client-facing exception, log function, log event, message template)
+_ERROR_TABLE: dict[
+    type[AppError], tuple[type[Exception], Callable[..., None], str, str]
+] = {
+    InvalidSessionId: (
+        ValueError,
+        log_warning,
+        "invalid_session_id",
+        "ERR_INVALID_SESSION: Invalid session_id. {exc}",
+    ),
+    InvalidItemId: (
+        ValueError,
+        log_warning,
+        "invalid_item_id",
+        "ERR_INVALID_ITEM: Invalid item_id. {exc}",
+    ),
+    NotFoundError: (ValueError, log_warning, "not_found", "ERR_NOT_FOUND: {exc}"),
+    ExpiredItemError: (ValueError, log_warning, "expired_item", "ERR_EXPIRED_ITEM: Item expired"),
+    ExternalCommandError: (
+        RuntimeError,
+        log_error,
+        "external_command_failed",
+        "ERR_EXTERNAL_COMMAND: External command failed. Check server logs for details.",
+    ),
+}
+
+_ERROR_MAP: dict[type[AppError], type[Exception]] = {
+    source: entry[0] for source, entry in _ERROR_TABLE.items()
+}
+
+_MAPPED_ERRORS = tuple(_ERROR_TABLE)
+
+
+def _lookup(exc_type: type[BaseException]) -> type[AppError]:
+    for cls in exc_type.__mro__:
+        if cls in _ERROR_TABLE:
+            return cls
+    raise KeyError(exc_type)
+
 
 def handle_mcp_errors(func: F) -> F:
     @wraps(func)
@@ -21,22 +61,9 @@ def handle_mcp_errors(func: F) -> F:
         with request_context():
             try:
                 return func(*args, **kwargs)
-            except InvalidSessionId as exc:
-                log_warning("invalid_session_id", error=str(exc))
-                raise ValueError(f"ERR_INVALID_SESSION: Invalid session_id. {exc}") from exc
-            except InvalidItemId as exc:
-                log_warning("invalid_item_id", error=str(exc))
-                raise ValueError(f"ERR_INVALID_ITEM: Invalid item_id. {exc}") from exc
-            except NotFoundError as exc:
-                log_warning("not_found", error=str(exc))
-                raise ValueError(f"ERR_NOT_FOUND: {exc}") from exc
-            except ExpiredItemError as exc:
-                log_warning("expired_item", error=str(exc))
-                raise ValueError("ERR_EXPIRED_ITEM: Item expired") from exc
-            except ExternalCommandError as exc:
-                log_error("external_command_failed", error=str(exc))
-                raise RuntimeError(
-                    "ERR_EXTERNAL_COMMAND: External command failed. Check server logs for details."
-                ) from exc
+            except _MAPPED_ERRORS as exc:
+                target, log, event, template = _ERROR_TABLE[_lookup(type(exc))]
+                log(event, error=str(exc))
+                raise target(template.format(exc=exc)) from exc
 
     return wrapper  # type: ignore[return-value]
@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-import re
-
 from domain.models import ManifestItem, TranscriptFormat
+from domain.urls import INVALID_YOUTUBE_URL_MESSAGE, is_youtube_url
 
 from .app import Context, mcp
 from .deps import get_services
@@ -10,13 +9,6 @@ from .error_handling import handle_mcp_errors
 from .session import get_session_id
 from logging_utils import log_debug, log_event, log_warning
 
-_YT_URL_RE = re.compile(r"^https?://(www\.)?youtube\.com/watch\?v=|^https?://youtu\.be/")
-
-
-def _is_youtube_url(url: str) -> bool:
-    return bool(_YT_URL_RE.search(url))
-
-
 def _parse_format(fmt: str) -> TranscriptFormat:
     try:
         return TranscriptFormat(fmt)
@@ -33,9 +25,9 @@ def _item_payload(item: ManifestItem, session_id: str) -> dict:
 
 @handle_mcp_errors
 def youtube_transcribe(url: str) -> str:
-    if not _is_youtube_url(url):
+    if not is_youtube_url(url):
         log_warning("invalid_youtube_url", url=url)
-        raise ValueError("Please provide a valid YouTube video URL (youtube.com/watch?v=... or youtu.be/...).")
+        raise ValueError(INVALID_YOUTUBE_URL_MESSAGE)
 
     services = get_services()
     log_event("youtube_transcribe", url=url)
@@ -49,9 +41,9 @@ def youtube_transcribe_to_file(
     session_id: str | None = None,
     ctx: Context = None,
 ) -> dict:
-    if not _is_youtube_url(url):
+    if not is_youtube_url(url):
         log_warning("invalid_youtube_url", url=url)
-        raise ValueError("Please provide a valid YouTube video URL (youtube.com/watch?v=... or youtu.be/...).")
+        raise ValueError(INVALID_YOUTUBE_URL_MESSAGE)
     format_enum = _parse_format(fmt)
 
     services = get_services()
@@ -74,9 +66,9 @@ def youtube_transcribe_to_file(
 
 @handle_mcp_errors
 def youtube_get_duration(url: str) -> dict:
-    if not _is_youtube_url(url):
+    if not is_youtube_url(url):
         log_warning("invalid_youtube_url", url=url)
-        raise ValueError("Please provide a valid YouTube video URL (youtube.com/watch?v=... or youtu.be/...).")
+        raise ValueError(INVALID_YOUTUBE_URL_MESSAGE)
 
     services = get_services()
     log_event("youtube_get_duration", url=url)
@@ -97,9 +89,9 @@ def youtube_transcribe_auto(
     session_id: str | None = None,
     ctx: Context = None,
 ) -> dict:
-    if not _is_youtube_url(url):
+    if not is_youtube_url(url):
         log_warning("invalid_youtube_url", url=url)
-        raise ValueError("Please provide a valid YouTube video URL (youtube.com/watch?v=... or youtu.be/...).")
+        raise ValueError(INVALID_YOUTUBE_URL_MESSAGE)
     format_enum = _parse_format(fmt)
 
     services = get_services()
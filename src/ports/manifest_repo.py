@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from typing import Protocol
+from typing import Iterable, Protocol
 
-from domain.models import ItemKind, Manifest, ManifestItem, TranscriptFormat
+from domain.models import ItemKind, ItemSpec, Manifest, ManifestItem, TranscriptFormat
 from domain.types import SessionId
 
 
@@ -29,6 +29,11 @@ class ManifestRepositoryPort(Protocol):
     ) -> ManifestItem:
         ...
 
+    def add_items(
+        self, session_id: SessionId | str, specs: Iterable[ItemSpec]
+    ) -> list[ManifestItem]:
+        ...
+
     def list_items(
         self,
         session_id: SessionId | str,
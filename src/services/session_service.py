@@ -11,7 +11,7 @@ from domain.types import ItemId, SessionId, coerce_item_id, coerce_session_id
 from ports.manifest_repo import ManifestRepositoryPort
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FileInfo:
     id: ItemId | None
     session_id: SessionId
@@ -24,7 +24,7 @@ class FileInfo:
     kind: ItemKind | None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FileChunk:
     data: str
     next_offset: int
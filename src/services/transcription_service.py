@@ -99,7 +99,7 @@ def default_writers() -> Mapping[TranscriptFormat, TranscriptWriter]:
     }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class VideoInfo:
     duration: int | None
     duration_string: str | None
@@ -107,7 +107,7 @@ class VideoInfo:
     is_live: bool | None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TranscriptionResult:
     kind: str
     text: str | None
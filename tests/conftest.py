@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import uuid
+from dataclasses import replace
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Iterable, Mapping
+
+import pytest
+
+from adapters.filesystem_store import SessionStore
+from adapters.ytdlp_client import YtDlpSubtitles
+from adapters.manifest_json_repo import ManifestRepository
+from domain.models import ItemKind, ManifestItem
+from domain.types import ItemId
+from services.session_service import SessionService
+from services.transcription_service import JsonlWriter, TranscriptParser, VttWriter
+
+
+class FakeYtDlpClient:
+    def __init__(self, vtt_text: str, info: dict | None = None) -> None:
+        self._vtt_text = vtt_text
+        self._info = info or {}
+
+    def get_info(self, url: str) -> dict:
+        return self._info
+
+    def get_subtitles(self, url: str) -> YtDlpSubtitles:
+        return YtDlpSubtitles(vtt_text=self._vtt_text, stdout="", picked_file="test.vtt")
+
+
+def _iso(value: datetime) -> str:
+    return value.replace(microsecond=0).isoformat() + "Z"
+
+
+def _bulk_seed(store, repo, session_id, specs: Iterable[Mapping[str, Any]]) -> list[ManifestItem]:
+    """Write each spec's file and append all items to the manifest in one save.
+
+    Spec keys: ``relpath`` (required), ``content``, ``id``, ``kind``, ``pinned``
+    and ``created_at``.
+    """
+    now = datetime.utcnow()
+    items: list[ManifestItem] = []
+    for spec in specs:
+        relpath = spec["relpath"]
+        content = spec.get("content", "")
+        path = store.resolve_relpath(session_id, relpath)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+        pinned = spec.get("pinned", False)
+        items.append(
+            ManifestItem(
+                id=ItemId(spec.get("id") or f"tr_{uuid.uuid4().hex}"),
+                kind=spec.get("kind", ItemKind.TRANSCRIPT),
+                format=path.suffix.lstrip(".") or "txt",
+                relpath=relpath,
+                size=len(content.encode("utf-8")),
+                created_at=spec.get("created_at", _iso(now)),
+                expires_at=None if pinned else _iso(now + timedelta(seconds=repo.default_ttl_sec)),
+                pinned=pinned,
+            )
+        )
+
+    manifest = repo.load(session_id)
+    repo.save(replace(manifest, items=[*manifest.items, *items]))
+    return items
+
+
+@pytest.fixture
+def bulk_seed():
+    return _bulk_seed
+
+
+@pytest.fixture
+def store_root(tmp_path_factory):
+    return tmp_path_factory.mktemp("sess")
+
+
+@pytest.fixture
+def session_env(store_root):
+    store = SessionStore(store_root)
+    repo = ManifestRepository(store, default_ttl_sec=3600)
+    return SimpleNamespace(store=store, repo=repo, service=SessionService(store, repo))
+
+
+@pytest.fixture(scope="session")
+def parser():
+    return TranscriptParser()
+
+
+@pytest.fixture(scope="session")
+def vtt_writer():
+    return VttWriter()
+
+
+@pytest.fixture(scope="session")
+def jsonl_writer():
+    return JsonlWriter()
+
+
+@pytest.fixture
+def fake_client(request):
+    return FakeYtDlpClient(request.param)
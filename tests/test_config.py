@@ -66,3 +66,13 @@ def test_config_from_env_uses_os_environ(monkeypatch):
     config = AppConfig.from_env()
     assert config.ytdlp_bin == "yt-custom"
     assert config.data_dir == Path("/tmp/data_env")
+
+
+def test_config_from_env_reuses_instance_for_same_values():
+    first = AppConfig.from_env({"YTDLP_TIMEOUT_SEC": "7", "UNRELATED": "a"})
+    second = AppConfig.from_env({"YTDLP_TIMEOUT_SEC": "7", "UNRELATED": "b"})
+    other = AppConfig.from_env({"YTDLP_TIMEOUT_SEC": "8"})
+
+    assert first is second
+    assert other is not first
+    assert other.timeout_sec == 8
@@ -34,3 +34,13 @@ def test_missing_item_raises_not_found(tmp_path):
 
     with pytest.raises(NotFoundError):
         service.delete_item("missing", session_id="sess_missing")
+
+
+def test_external_command_error_renders_code_and_output_tail():
+    exc = ExternalCommandError("yt-dlp failed", returncode=2, output="x" * 5000 + "tail")
+
+    assert exc.returncode == 2
+    assert len(exc.output) == 4096
+    assert exc.output.endswith("tail")
+    assert str(exc).startswith("yt-dlp failed (code 2). Output:\nxxx")
+    assert str(ExternalCommandError("plain")) == "plain"
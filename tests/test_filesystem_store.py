@@ -52,3 +52,15 @@ def test_resolve_relpath_rejects_symlink_escape(tmp_path):
 
     with pytest.raises(ValueError):
         store.resolve_relpath(session_id, "transcripts/escape")
+
+
+def test_derived_path_does_not_create_dirs(tmp_path):
+    store = SessionStore(tmp_path)
+    session_id = SessionId("sess_derived")
+
+    path = store.derived_path(session_id, "notes/a.txt")
+    assert path == tmp_path / "sess_derived" / "derived" / "notes" / "a.txt"
+    assert not (tmp_path / "sess_derived").exists()
+
+    with pytest.raises(ValueError):
+        store.derived_path(session_id, "../escape.txt")
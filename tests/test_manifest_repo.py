@@ -4,7 +4,7 @@ import os
 
 from adapters.filesystem_store import SessionStore
 from adapters.manifest_json_repo import ManifestRepository
-from domain.models import ItemKind, TranscriptFormat
+from domain.models import ItemKind, ItemSpec, TranscriptFormat
 from domain.types import SessionId
 
 
@@ -116,3 +116,48 @@ def test_repo_uses_clock_for_timestamps(tmp_path):
     expected_expires = (fixed_time + timedelta(seconds=60)).isoformat() + "Z"
     assert item.created_at == expected_created
     assert item.expires_at == expected_expires
+
+
+def test_repo_add_items_saves_once(tmp_path, monkeypatch):
+    store = SessionStore(tmp_path)
+    repo = ManifestRepository(store, default_ttl_sec=3600)
+    session_id = SessionId("sess_bulk")
+
+    tdir = store.transcripts_dir(session_id)
+    (tdir / "a.txt").write_text("a", encoding="utf-8")
+    (tdir / "b.vtt").write_text("bb", encoding="utf-8")
+
+    saves = []
+    real_save = repo.save
+
+    def counting_save(manifest):
+        saves.append(len(manifest.items))
+        real_save(manifest)
+
+    monkeypatch.setattr(repo, "save", counting_save)
+
+    first, second = repo.add_items(
+        session_id,
+        [
+            ItemSpec(ItemKind.TRANSCRIPT, TranscriptFormat.TXT, "transcripts/a.txt", 3600),
+            ItemSpec(ItemKind.TRANSCRIPT, "vtt", "transcripts/b.vtt", 3600, pinned=True),
+        ],
+    )
+
+    assert saves == [2]
+    assert (first.format, first.size, first.pinned) == ("txt", 1, False)
+    assert (second.format, second.size, second.pinned) == ("vtt", 2, True)
+    assert second.expires_at is None
+    assert [item.id for item in repo.list_items(session_id)] == [first.id, second.id]
+
+
+def test_repo_add_items_empty_skips_manifest(tmp_path, monkeypatch):
+    store = SessionStore(tmp_path)
+    repo = ManifestRepository(store, default_ttl_sec=3600)
+    calls = []
+    monkeypatch.setattr(repo, "load", lambda *args: calls.append("load"))
+    monkeypatch.setattr(repo, "save", lambda *args: calls.append("save"))
+    monkeypatch.setattr(repo, "cleanup_session", lambda *args: calls.append("cleanup"))
+
+    assert repo.add_items(SessionId("sess_empty"), []) == []
+    assert calls == []
@@ -2,6 +2,7 @@ import builtins
 from dataclasses import replace
 from datetime import datetime, timedelta
 from pathlib import Path
+from unittest import mock
 
 import pytest
 
@@ -72,31 +73,19 @@ def test_load_skips_invalid_items(tmp_path):
     assert str(manifest.items[0].id) == "tr_valid"
 
 
-def test_list_items_filters_str_kind_format_and_pinned(tmp_path):
+def test_list_items_filters_str_kind_format_and_pinned(tmp_path, bulk_seed):
     store = SessionStore(tmp_path)
     repo = ManifestRepository(store, default_ttl_sec=3600)
     session_id = SessionId("sess_filters")
 
-    first_path = store.transcripts_dir(session_id) / "first.txt"
-    first_path.write_text("one", encoding="utf-8")
-    second_path = store.transcripts_dir(session_id) / "second.txt"
-    second_path.write_text("two", encoding="utf-8")
-
-    repo.add_item(
-        session_id=session_id,
-        kind=ItemKind.TRANSCRIPT,
-        fmt=TranscriptFormat.TXT,
-        relpath="transcripts/first.txt",
-        pinned=True,
-        ttl_seconds=3600,
-    )
-    repo.add_item(
-        session_id=session_id,
-        kind=ItemKind.TRANSCRIPT,
-        fmt=TranscriptFormat.TXT,
-        relpath="transcripts/second.txt",
-        pinned=False,
-        ttl_seconds=3600,
+    bulk_seed(
+        store,
+        repo,
+        session_id,
+        [
+            {"relpath": "transcripts/first.txt", "content": "one", "pinned": True},
+            {"relpath": "transcripts/second.txt", "content": "two"},
+        ],
     )
 
     items = repo.list_items(session_id, kind="transcript", format="txt", pinned=True)
@@ -162,7 +151,7 @@ def test_cleanup_session_handles_invalid_missing_and_updates_size(tmp_path):
     assert kept.expires_at is not None
 
 
-def test_cleanup_session_handles_unlink_error(monkeypatch, tmp_path):
+def test_cleanup_session_handles_unlink_error(tmp_path):
     store = SessionStore(tmp_path)
     repo = ManifestRepository(store, default_ttl_sec=3600)
     session_id = SessionId("sess_unlink")
@@ -188,9 +177,8 @@ def test_cleanup_session_handles_unlink_error(monkeypatch, tmp_path):
             raise OSError("blocked")
         return real_unlink(self, *args, **kwargs)
 
-    monkeypatch.setattr(Path, "unlink", fake_unlink)
-
-    removed = repo.cleanup_session(session_id)
+    with mock.patch.object(Path, "unlink", autospec=True, side_effect=fake_unlink):
+        removed = repo.cleanup_session(session_id)
     assert removed == 1
     assert repo.list_items(session_id) == []
 
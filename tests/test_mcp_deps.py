@@ -1,16 +1,36 @@
-from mcp_server.deps import build_services, get_services, set_services
+import pytest
 
+import mcp_server.deps as deps
+from mcp_server.deps import Services, build_services, get_services, set_services
 
-def test_build_services_default_config():
-    services = build_services()
-    assert services.config is not None
-    assert services.store is not None
 
+pytestmark = pytest.mark.xdist_group("mcp_singleton")
 
-def test_get_services_initializes_singleton():
+
+@pytest.fixture(scope="module")
+def prebuilt():
+    return build_services()
+
+
+def test_build_services_default_config(prebuilt):
+    assert prebuilt.config is not None
+    assert prebuilt.store is not None
+
+
+def test_get_services_initializes_singleton(prebuilt, monkeypatch):
+    calls = []
+
+    def fake_build(config=None):
+        calls.append(config)
+        return prebuilt
+
+    monkeypatch.setattr(deps, "build_services", fake_build)
     set_services(None)
     try:
         services = get_services()
-        assert services.config is not None
+        assert isinstance(services, Services)
+        assert services is prebuilt
+        assert get_services() is services
+        assert calls == [None]
     finally:
         set_services(None)
@@ -7,7 +7,23 @@ from domain.errors import (
     InvalidSessionId,
     NotFoundError,
 )
-from mcp_server.error_handling import handle_mcp_errors
+from mcp_server.error_handling import _ERROR_MAP, _ERROR_TABLE, handle_mcp_errors
+
+
+@pytest.mark.parametrize(
+    "src,dst,code",
+    [
+        (InvalidSessionId, ValueError, "ERR_INVALID_SESSION"),
+        (InvalidItemId, ValueError, "ERR_INVALID_ITEM"),
+        (NotFoundError, ValueError, "ERR_NOT_FOUND"),
+        (ExpiredItemError, ValueError, "ERR_EXPIRED_ITEM"),
+        (ExternalCommandError, RuntimeError, "ERR_EXTERNAL_COMMAND"),
+    ],
+)
+def test_error_map_entries(src, dst, code):
+    assert _ERROR_MAP[src] is dst
+    assert _ERROR_TABLE[src][0] is dst
+    assert _ERROR_TABLE[src][3].startswith(f"{code}:")
 
 
 @handle_mcp_errors
@@ -15,51 +31,30 @@ def _raise_invalid_session():
     raise InvalidSessionId("session_id must be 1-64 chars of letters, numbers, '-' or '_'")
 
 
-@handle_mcp_errors
-def _raise_invalid_item():
-    raise InvalidItemId("item_id must be 1-64 chars of letters, numbers, '-' or '_'")
-
-
-@handle_mcp_errors
-def _raise_not_found():
-    raise NotFoundError("Item not found")
-
-
 @handle_mcp_errors
 def _raise_external():
     raise ExternalCommandError("yt-dlp failed")
 
 
-@handle_mcp_errors
-def _raise_expired():
-    raise ExpiredItemError("expired")
-
-
 def test_invalid_session_maps_to_value_error():
     with pytest.raises(ValueError) as exc:
         _raise_invalid_session()
     assert "ERR_INVALID_SESSION" in str(exc.value)
-
-
-def test_invalid_item_maps_to_value_error():
-    with pytest.raises(ValueError) as exc:
-        _raise_invalid_item()
-    assert "ERR_INVALID_ITEM" in str(exc.value)
-
-
-def test_not_found_maps_to_value_error():
-    with pytest.raises(ValueError) as exc:
-        _raise_not_found()
-    assert "ERR_NOT_FOUND" in str(exc.value)
+    assert "session_id must be 1-64 chars" in str(exc.value)
+    assert isinstance(exc.value.__cause__, InvalidSessionId)
 
 
 def test_external_command_maps_to_runtime_error():
     with pytest.raises(RuntimeError) as exc:
         _raise_external()
     assert "ERR_EXTERNAL_COMMAND" in str(exc.value)
+    assert not isinstance(exc.value, ValueError)
 
 
-def test_expired_item_maps_to_value_error():
-    with pytest.raises(ValueError) as exc:
-        _raise_expired()
-    assert "ERR_EXPIRED_ITEM" in str(exc.value)
+def test_unmapped_errors_pass_through():
+    @handle_mcp_errors
+    def _raise_plain():
+        raise ValueError("plain")
+
+    with pytest.raises(ValueError, match="^plain$"):
+        _raise_plain()
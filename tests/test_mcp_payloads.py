@@ -1,4 +1,7 @@
-import json
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
 
 from mcp_server.payloads import build_prompt_payload, json_payload
 
@@ -6,7 +9,7 @@ from mcp_server.payloads import build_prompt_payload, json_payload
 def test_json_payload_round_trip():
     payload = {"name": "test", "value": 123}
     rendered = json_payload(payload)
-    assert json.loads(rendered) == payload
+    assert _loads(rendered) == payload
 
 
 def test_build_prompt_payload_includes_inputs_and_steps():
@@ -17,7 +20,7 @@ def test_build_prompt_payload_includes_inputs_and_steps():
         prompt="Prompt text",
         extra_inputs={"target_lang": "en"},
     )
-    data = json.loads(rendered)
+    data = _loads(rendered)
 
     assert data["name"] == "summary"
     assert data["prompt"] == "Prompt text"
@@ -35,7 +38,7 @@ def test_build_prompt_payload_uses_placeholder_session():
         session_id=None,
         prompt="Prompt text",
     )
-    data = json.loads(rendered)
+    data = _loads(rendered)
 
     assert data["inputs"] == {"item_id": "tr_123"}
     assert "YOUR_SESSION_ID" in data["recommended_steps"][0]
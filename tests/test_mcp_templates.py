@@ -1,4 +1,7 @@
-import json
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
 
 from mcp_server.templates import (
     template_action_items,
@@ -14,7 +17,7 @@ from mcp_server.templates import (
 def test_template_translate_includes_target_lang_and_session():
     ctx = {"mcp-session-id": "sess_translate"}
     payload = template_translate("tr_abc123", "French%20CA", ctx=ctx)
-    data = json.loads(payload)
+    data = _loads(payload)
 
     assert data["name"] == "translate"
     assert data["inputs"]["item_id"] == "tr_abc123"
@@ -25,7 +28,7 @@ def test_template_translate_includes_target_lang_and_session():
 
 def test_template_outline_uses_placeholder_session():
     payload = template_outline("tr_abc123")
-    data = json.loads(payload)
+    data = _loads(payload)
     assert data["inputs"]["item_id"] == "tr_abc123"
     assert "YOUR_SESSION_ID" in data["recommended_steps"][0]
 
@@ -33,14 +36,14 @@ def test_template_outline_uses_placeholder_session():
 def test_template_reflow_includes_session():
     ctx = {"mcp-session-id": "sess_reflow"}
     payload = template_reflow("tr_abc123", ctx=ctx)
-    data = json.loads(payload)
+    data = _loads(payload)
     assert data["name"] == "paragraphs"
     assert data["inputs"]["session_id"] == "sess_reflow"
 
 
 def test_template_quotes_uses_placeholder_session():
     payload = template_quotes("tr_abc123")
-    data = json.loads(payload)
+    data = _loads(payload)
     assert data["name"] == "quotes"
     assert data["inputs"]["item_id"] == "tr_abc123"
     assert "YOUR_SESSION_ID" in data["recommended_steps"][0]
@@ -49,7 +52,7 @@ def test_template_quotes_uses_placeholder_session():
 def test_template_faq_includes_inputs():
     ctx = {"mcp-session-id": "sess_faq"}
     payload = template_faq("tr_abc123", ctx=ctx)
-    data = json.loads(payload)
+    data = _loads(payload)
     assert data["name"] == "faq"
     assert data["inputs"]["item_id"] == "tr_abc123"
     assert data["inputs"]["session_id"] == "sess_faq"
@@ -58,7 +61,7 @@ def test_template_faq_includes_inputs():
 def test_template_glossary_includes_inputs():
     ctx = {"mcp-session-id": "sess_glossary"}
     payload = template_glossary("tr_abc123", ctx=ctx)
-    data = json.loads(payload)
+    data = _loads(payload)
     assert data["name"] == "glossary"
     assert data["inputs"]["session_id"] == "sess_glossary"
 
@@ -66,6 +69,6 @@ def test_template_glossary_includes_inputs():
 def test_template_action_items_includes_inputs():
     ctx = {"mcp-session-id": "sess_actions"}
     payload = template_action_items("tr_abc123", ctx=ctx)
-    data = json.loads(payload)
+    data = _loads(payload)
     assert data["name"] == "action_items"
     assert data["inputs"]["session_id"] == "sess_actions"
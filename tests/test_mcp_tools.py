@@ -13,7 +13,7 @@ from services.transcription_service import TranscriptionResult, VideoInfo
 import mcp_server.tools as tools
 
 
-@dataclass
+@dataclass(frozen=True)
 class FakeConfig:
     default_session_id: str = ""
     auto_text_max_bytes: int = 200000
@@ -96,52 +96,56 @@ class FakeSessionService:
         return self.chunk
 
 
-def _make_item() -> ManifestItem:
-    return ManifestItem(
-        id=ItemId("item-1"),
-        kind=ItemKind.TRANSCRIPT,
-        format=TranscriptFormat.TXT,
-        relpath="transcripts/sample.txt",
-        size=12,
-        created_at="2024-01-01T00:00:00Z",
-        expires_at=None,
-        pinned=False,
-    )
-
-
-def _make_services(*, auto_result: TranscriptionResult | None = None):
-    item = _make_item()
-    info = FileInfo(
-        id=item.id,
-        session_id=SessionId("session-1"),
-        path=Path("/tmp/path.txt"),
-        relpath=item.relpath,
-        size=item.size,
-        pinned=item.pinned,
-        expires_at=item.expires_at,
-        format=item.format,
-        kind=item.kind,
-    )
-    chunk = FileChunk(
-        data="chunk",
-        next_offset=5,
-        eof=True,
-        size=item.size,
-        path=Path("/tmp/path.txt"),
-        id=item.id,
-    )
-    if auto_result is None:
-        auto_result = TranscriptionResult(
-            kind="text",
-            text="auto",
-            item=None,
-            bytes=4,
-            info=VideoInfo(duration=None, duration_string=None, title=None, is_live=None),
-        )
+_EMPTY_VIDEO_INFO = VideoInfo(duration=None, duration_string=None, title=None, is_live=None)
+_ITEM = ManifestItem(
+    id=ItemId("item-1"),
+    kind=ItemKind.TRANSCRIPT,
+    format=TranscriptFormat.TXT,
+    relpath="transcripts/sample.txt",
+    size=12,
+    created_at="2024-01-01T00:00:00Z",
+    expires_at=None,
+    pinned=False,
+)
+_INFO = FileInfo(
+    id=_ITEM.id,
+    session_id=SessionId("session-1"),
+    path=Path("/tmp/path.txt"),
+    relpath=_ITEM.relpath,
+    size=_ITEM.size,
+    pinned=_ITEM.pinned,
+    expires_at=_ITEM.expires_at,
+    format=_ITEM.format,
+    kind=_ITEM.kind,
+)
+_CHUNK = FileChunk(
+    data="chunk",
+    next_offset=5,
+    eof=True,
+    size=_ITEM.size,
+    path=Path("/tmp/path.txt"),
+    id=_ITEM.id,
+)
+_DEFAULT_AUTO_RESULT = TranscriptionResult(
+    kind="text",
+    text="auto",
+    item=None,
+    bytes=4,
+    info=_EMPTY_VIDEO_INFO,
+)
+_CONFIG = FakeConfig()
+
+
+@pytest.fixture
+def services():
     return SimpleNamespace(
-        config=FakeConfig(),
-        transcription_service=FakeTranscriptionService(text="plain", item=item, auto_result=auto_result),
-        session_service=FakeSessionService(item=item, info=info, chunk=chunk),
+        config=_CONFIG,
+        transcription_service=FakeTranscriptionService(
+            text="plain",
+            item=_ITEM,
+            auto_result=_DEFAULT_AUTO_RESULT,
+        ),
+        session_service=FakeSessionService(item=_ITEM, info=_INFO, chunk=_CHUNK),
         ytdlp_client=FakeYtdlpClient(
             {
                 "duration": 12,
@@ -153,15 +157,17 @@ def _make_services(*, auto_result: TranscriptionResult | None = None):
     )
 
 
+@pytest.fixture(autouse=True)
+def _patch_get_services(monkeypatch, services):
+    monkeypatch.setattr(tools, "get_services", lambda: services)
+
+
 def test_youtube_transcribe_rejects_invalid_url():
     with pytest.raises(ValueError, match="Please provide a valid YouTube video URL"):
         tools.youtube_transcribe("https://example.com/video")
 
 
-def test_youtube_transcribe_uses_service(monkeypatch):
-    services = _make_services()
-    monkeypatch.setattr(tools, "get_services", lambda: services)
-
+def test_youtube_transcribe_uses_service(services):
     text = tools.youtube_transcribe("https://youtu.be/demo")
 
     assert text == "plain"
@@ -173,10 +179,7 @@ def test_youtube_transcribe_to_file_rejects_invalid_format():
         tools.youtube_transcribe_to_file("https://youtu.be/demo", fmt="doc", session_id="session-1")
 
 
-def test_youtube_transcribe_to_file_returns_payload(monkeypatch):
-    services = _make_services()
-    monkeypatch.setattr(tools, "get_services", lambda: services)
-
+def test_youtube_transcribe_to_file_returns_payload():
     payload = tools.youtube_transcribe_to_file("https://youtu.be/demo", session_id="session-1")
 
     assert payload["session_id"] == "session-1"
@@ -184,10 +187,7 @@ def test_youtube_transcribe_to_file_returns_payload(monkeypatch):
     assert payload["kind"] == ItemKind.TRANSCRIPT.value
 
 
-def test_youtube_get_duration_payload(monkeypatch):
-    services = _make_services()
-    monkeypatch.setattr(tools, "get_services", lambda: services)
-
+def test_youtube_get_duration_payload():
     payload = tools.youtube_get_duration("https://youtu.be/demo")
 
     assert payload["duration"] == 12
@@ -196,10 +196,7 @@ def test_youtube_get_duration_payload(monkeypatch):
     assert payload["is_live"] is False
 
 
-def test_youtube_transcribe_auto_returns_text(monkeypatch):
-    services = _make_services()
-    monkeypatch.setattr(tools, "get_services", lambda: services)
-
+def test_youtube_transcribe_auto_returns_text():
     payload = tools.youtube_transcribe_auto("https://youtu.be/demo")
 
     assert payload["kind"] == "text"
@@ -207,27 +204,21 @@ def test_youtube_transcribe_auto_returns_text(monkeypatch):
     assert payload["bytes"] == 4
 
 
-def test_youtube_transcribe_auto_requires_session_for_file(monkeypatch):
-    item = _make_item()
-    auto_result = TranscriptionResult(
+def test_youtube_transcribe_auto_requires_session_for_file(monkeypatch, services):
+    services.transcription_service.auto_result = TranscriptionResult(
         kind="file",
         text=None,
-        item=item,
+        item=_ITEM,
         bytes=2000,
-        info=VideoInfo(duration=None, duration_string=None, title=None, is_live=None),
+        info=_EMPTY_VIDEO_INFO,
     )
-    services = _make_services(auto_result=auto_result)
-    monkeypatch.setattr(tools, "get_services", lambda: services)
     monkeypatch.setattr(tools, "get_session_id", lambda **_kwargs: None)
 
     with pytest.raises(ValueError, match="session_id is required"):
         tools.youtube_transcribe_auto("https://youtu.be/demo")
 
 
-def test_session_management_tools(monkeypatch):
-    services = _make_services()
-    monkeypatch.setattr(tools, "get_services", lambda: services)
-
+def test_session_management_tools():
     payload = tools.list_session_items(session_id="session-1")
     assert payload["session_id"] == "session-1"
     assert payload["items"][0]["id"] == "item-1"
@@ -238,10 +229,7 @@ def test_session_management_tools(monkeypatch):
     assert tools.delete_item("item-1", session_id="session-1")["deleted"] is True
 
 
-def test_file_tools(monkeypatch):
-    services = _make_services()
-    monkeypatch.setattr(tools, "get_services", lambda: services)
-
+def test_file_tools():
     payload = tools.write_text_file("notes.txt", "hi", session_id="session-1")
     assert payload["session_id"] == "session-1"
     assert payload["id"] == "item-1"
@@ -1,4 +1,8 @@
 import importlib
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
 
 import mcp_server.app as mcp_app
 
@@ -41,24 +45,29 @@ class RecordingMCP:
         return func
 
 
-def test_mcp_wiring_registers_tools_and_resources(monkeypatch):
+@pytest.fixture(scope="module")
+def registered_mcp():
     recorder = RecordingMCP()
-    monkeypatch.setattr(mcp_app, "mcp", recorder)
 
     import mcp_server.tools as tools
     import mcp_server.resources as resources
     import mcp_server.templates as templates
 
-    importlib.reload(tools)
-    importlib.reload(resources)
-    importlib.reload(templates)
+    with mock.patch.object(mcp_app, "mcp", recorder):
+        importlib.reload(tools)
+        importlib.reload(resources)
+        importlib.reload(templates)
+
+    return SimpleNamespace(
+        tool_names={tool.__name__ for tool in recorder.tools},
+        resource_paths={path for path, _ in recorder.resources},
+        prompt_names={name for name, _ in recorder.prompts},
+    )
 
-    tool_names = {tool.__name__ for tool in recorder.tools}
-    resource_paths = {path for path, _ in recorder.resources}
-    prompt_names = {name for name, _ in recorder.prompts}
 
-    assert "youtube_transcribe" in tool_names
-    assert "read_file_chunk" in tool_names
-    assert any(path.startswith("transcripts://") for path in resource_paths)
-    assert any(path.startswith("template://") for path in resource_paths)
-    assert "summary" in prompt_names
+def test_mcp_wiring_registers_tools_resources_and_prompts(registered_mcp):
+    assert "youtube_transcribe" in registered_mcp.tool_names
+    assert "read_file_chunk" in registered_mcp.tool_names
+    assert any(path.startswith("transcripts://") for path in registered_mcp.resource_paths)
+    assert any(path.startswith("template://") for path in registered_mcp.resource_paths)
+    assert "summary" in registered_mcp.prompt_names
@@ -1,12 +1,9 @@
 import json
 import pytest
-from dataclasses import replace
+from uuid import uuid4
 
-from adapters.filesystem_store import SessionStore
-from adapters.manifest_json_repo import ManifestRepository
 from config import AppConfig
 from domain.models import ItemKind, TranscriptFormat
-from domain.time_utils import parse_iso_timestamp
 from domain.types import SessionId
 from mcp_server.deps import build_services, set_services
 from mcp_server.resources import (
@@ -15,19 +12,49 @@ from mcp_server.resources import (
     resource_session_latest,
 )
 from mcp_server.templates import template_summary
-from services.session_service import SessionService
 
 
-def _make_services(tmp_path):
-    config = AppConfig.from_env({"DATA_DIR": str(tmp_path)})
+pytestmark = pytest.mark.xdist_group("mcp_singleton")
+
+
+def _make_services(root, **env):
+    config = AppConfig.from_env({"DATA_DIR": str(root), **env})
     return build_services(config)
 
 
-def test_read_file_info_and_chunk(tmp_path):
-    store = SessionStore(tmp_path)
-    repo = ManifestRepository(store, default_ttl_sec=3600)
-    service = SessionService(store, repo)
-    session_id = SessionId("sess_read")
+@pytest.fixture(scope="module")
+def shared_services(tmp_path_factory):
+    return _make_services(tmp_path_factory.mktemp("data"))
+
+
+@pytest.fixture(scope="module")
+def truncating_services(tmp_path_factory):
+    return _make_services(tmp_path_factory.mktemp("data"), INLINE_TEXT_MAX_BYTES="1")
+
+
+@pytest.fixture(scope="module")
+def default_session_services(tmp_path_factory):
+    return _make_services(tmp_path_factory.mktemp("data"), DEFAULT_SESSION_ID="sess_default")
+
+
+@pytest.fixture
+def bound_services(request):
+    services = request.getfixturevalue(getattr(request, "param", "shared_services"))
+    set_services(services)
+    yield services
+    set_services(None)
+
+
+@pytest.fixture
+def isolated_session_id():
+    return SessionId(f"sess_{uuid4().hex[:8]}")
+
+
+def test_read_file_info_and_chunk(shared_services, isolated_session_id):
+    store = shared_services.store
+    repo = shared_services.manifest_repo
+    service = shared_services.session_service
+    session_id = isolated_session_id
 
     target = store.transcripts_dir(session_id) / "read.txt"
     target.write_text("hello world", encoding="utf-8")
@@ -53,33 +80,29 @@ def test_read_file_info_and_chunk(tmp_path):
     assert chunk.id == item.id
 
 
-def test_resource_session_item_inline(tmp_path):
-    services = _make_services(tmp_path)
-    set_services(services)
-    try:
-        store = services.store
-        repo = services.manifest_repo
-        session_id = SessionId("sess_resource")
-        relpath = "transcripts/inline.txt"
-        target = store.transcripts_dir(session_id) / "inline.txt"
-        target.write_text("inline", encoding="utf-8")
-        item = repo.add_item(
-            session_id=session_id,
-            kind=ItemKind.TRANSCRIPT,
-            fmt=TranscriptFormat.TXT,
-            relpath=relpath,
-            pinned=False,
-            ttl_seconds=3600,
-        )
-
-        payload = resource_session_item(str(session_id), str(item.id))
-        data = json.loads(payload)
-        assert data["session_id"] == str(session_id)
-        assert data["item"]["id"] == str(item.id)
-        assert data["content"] == "inline"
-        assert data["truncated"] is False
-    finally:
-        set_services(None)
+def test_resource_session_item_inline(bound_services, isolated_session_id):
+    services = bound_services
+    store = services.store
+    repo = services.manifest_repo
+    session_id = isolated_session_id
+    relpath = "transcripts/inline.txt"
+    target = store.transcripts_dir(session_id) / "inline.txt"
+    target.write_text("inline", encoding="utf-8")
+    item = repo.add_item(
+        session_id=session_id,
+        kind=ItemKind.TRANSCRIPT,
+        fmt=TranscriptFormat.TXT,
+        relpath=relpath,
+        pinned=False,
+        ttl_seconds=3600,
+    )
+
+    payload = resource_session_item(str(session_id), str(item.id))
+    data = json.loads(payload)
+    assert data["session_id"] == str(session_id)
+    assert data["item"]["id"] == str(item.id)
+    assert data["content"] == "inline"
+    assert data["truncated"] is False
 
 
 def test_template_summary_includes_session():
@@ -90,106 +113,68 @@ def test_template_summary_includes_session():
     assert "transcripts://session/sess_template/item/tr_abc123" in data["recommended_steps"][0]
 
 
-def test_resource_session_item_truncates_large_content(tmp_path):
-    config = AppConfig.from_env(
-        {"DATA_DIR": str(tmp_path), "INLINE_TEXT_MAX_BYTES": "1"}
+@pytest.mark.parametrize("bound_services", ["truncating_services"], indirect=True)
+def test_resource_session_item_truncates_large_content(bound_services, isolated_session_id):
+    services = bound_services
+    store = services.store
+    repo = services.manifest_repo
+    session_id = isolated_session_id
+    relpath = "transcripts/large.txt"
+    target = store.transcripts_dir(session_id) / "large.txt"
+    target.write_text("longer text", encoding="utf-8")
+    item = repo.add_item(
+        session_id=session_id,
+        kind=ItemKind.TRANSCRIPT,
+        fmt=TranscriptFormat.TXT,
+        relpath=relpath,
+        pinned=False,
+        ttl_seconds=3600,
     )
-    services = build_services(config)
-    set_services(services)
-    try:
-        store = services.store
-        repo = services.manifest_repo
-        session_id = SessionId("sess_truncate")
-        relpath = "transcripts/large.txt"
-        target = store.transcripts_dir(session_id) / "large.txt"
-        target.write_text("longer text", encoding="utf-8")
-        item = repo.add_item(
-            session_id=session_id,
-            kind=ItemKind.TRANSCRIPT,
-            fmt=TranscriptFormat.TXT,
-            relpath=relpath,
-            pinned=False,
-            ttl_seconds=3600,
-        )
-
-        payload = resource_session_item(str(session_id), str(item.id))
-        data = json.loads(payload)
-        assert data["content"] is None
-        assert data["truncated"] is True
-    finally:
-        set_services(None)
-
-
-def test_resource_session_latest_returns_newest_item(tmp_path):
-    services = _make_services(tmp_path)
-    set_services(services)
-    try:
-        store = services.store
-        repo = services.manifest_repo
-        session_id = SessionId("sess_latest")
-        first_path = store.transcripts_dir(session_id) / "first.txt"
-        first_path.write_text("first", encoding="utf-8")
-        second_path = store.transcripts_dir(session_id) / "second.txt"
-        second_path.write_text("second", encoding="utf-8")
-
-        first = repo.add_item(
-            session_id=session_id,
-            kind=ItemKind.TRANSCRIPT,
-            fmt=TranscriptFormat.TXT,
-            relpath="transcripts/first.txt",
-            pinned=False,
-            ttl_seconds=3600,
-        )
-        second = repo.add_item(
-            session_id=session_id,
-            kind=ItemKind.TRANSCRIPT,
-            fmt=TranscriptFormat.TXT,
-            relpath="transcripts/second.txt",
-            pinned=False,
-            ttl_seconds=3600,
-        )
-
-        manifest = repo.load(session_id)
-        updated_items = []
-        for entry in manifest.items:
-            if entry.id == first.id:
-                updated_items.append(replace(entry, created_at="2024-01-01T00:00:00Z"))
-            elif entry.id == second.id:
-                updated_items.append(replace(entry, created_at="2024-01-01T00:00:01Z"))
-            else:
-                updated_items.append(entry)
-        repo.save(replace(manifest, items=updated_items))
-
-        payload = resource_session_latest(str(session_id))
-        data = json.loads(payload)
-        assert data["item"]["id"] == str(second.id)
-    finally:
-        set_services(None)
-
-
-def test_resource_session_index_uses_default_session_id(tmp_path):
-    config = AppConfig.from_env(
-        {"DATA_DIR": str(tmp_path), "DEFAULT_SESSION_ID": "sess_default"}
+
+    payload = resource_session_item(str(session_id), str(item.id))
+    data = json.loads(payload)
+    assert data["content"] is None
+    assert data["truncated"] is True
+
+
+@pytest.fixture
+def seeded_latest_session(shared_services, isolated_session_id, bulk_seed):
+    # Newest first, so the resource has to sort rather than take the last entry.
+    bulk_seed(
+        shared_services.store,
+        shared_services.manifest_repo,
+        isolated_session_id,
+        [
+            {
+                "id": "tr_second",
+                "relpath": "transcripts/second.txt",
+                "content": "second",
+                "created_at": "2024-01-01T00:00:01Z",
+            },
+            {
+                "id": "tr_first",
+                "relpath": "transcripts/first.txt",
+                "content": "first",
+                "created_at": "2024-01-01T00:00:00Z",
+            },
+        ],
     )
-    services = build_services(config)
-    set_services(services)
-    try:
-        payload = resource_session_index("")
-        data = json.loads(payload)
-        assert data["session_id"] == "sess_default"
-    finally:
-        set_services(None)
+    return isolated_session_id
 
 
-def test_resource_session_index_requires_session_id(tmp_path):
-    services = _make_services(tmp_path)
-    set_services(services)
-    try:
-        with pytest.raises(ValueError):
-            resource_session_index("")
-    finally:
-        set_services(None)
+def test_resource_session_latest_returns_newest_item(bound_services, seeded_latest_session):
+    payload = resource_session_latest(str(seeded_latest_session))
+    data = json.loads(payload)
+    assert data["item"]["id"] == "tr_second"
+
+
+@pytest.mark.parametrize("bound_services", ["default_session_services"], indirect=True)
+def test_resource_session_index_uses_default_session_id(bound_services):
+    payload = resource_session_index("")
+    data = json.loads(payload)
+    assert data["session_id"] == "sess_default"
 
 
-def test_parse_ts_returns_none_on_invalid():
-    assert parse_iso_timestamp("not-a-date") is None
+def test_resource_session_index_requires_session_id(bound_services):
+    with pytest.raises(ValueError):
+        resource_session_index("")
@@ -1,36 +1,42 @@
+import os
+import sys
 from pathlib import Path
+from unittest import mock
 
 import pytest
 
-from adapters.filesystem_store import SessionStore
-from adapters.manifest_json_repo import ManifestRepository
 from domain.errors import NotFoundError
-from domain.models import ItemKind, TranscriptFormat
+from domain.models import ItemKind, ItemSpec, TranscriptFormat
 from domain.types import SessionId
-from services.session_service import SessionService
 
 
-def test_set_item_ttl_rejects_non_positive(tmp_path):
-    store = SessionStore(tmp_path)
-    repo = ManifestRepository(store, default_ttl_sec=3600)
-    service = SessionService(store, repo)
-    session_id = SessionId("sess_ttl")
+SID = SessionId("sess_test")
+
+
+_DATA = b"data"
+_KEEP = b"keep"
+_HELLO = b"hello"
+_ONE = b"one"
+_TWO = b"two"
+
+
+def test_set_item_ttl_rejects_non_positive(session_env):
+    service = session_env.service
 
     with pytest.raises(ValueError):
-        service.set_item_ttl("tr_ttl", 0, session_id=session_id)
+        service.set_item_ttl("tr_ttl", 0, session_id=SID)
 
 
-def test_set_item_ttl_updates_item(tmp_path):
-    store = SessionStore(tmp_path)
-    repo = ManifestRepository(store, default_ttl_sec=3600)
-    service = SessionService(store, repo)
-    session_id = SessionId("sess_ttl_ok")
+def test_set_item_ttl_updates_item(session_env):
+    store = session_env.store
+    repo = session_env.repo
+    service = session_env.service
 
-    target = store.transcripts_dir(session_id) / "ttl.txt"
-    target.write_text("data", encoding="utf-8")
+    target = store.transcripts_dir(SID) / "ttl.txt"
+    target.write_bytes(_DATA)
 
     item = repo.add_item(
-        session_id=session_id,
+        session_id=SID,
         kind=ItemKind.TRANSCRIPT,
         fmt=TranscriptFormat.TXT,
         relpath="transcripts/ttl.txt",
@@ -38,22 +44,21 @@ def test_set_item_ttl_updates_item(tmp_path):
         ttl_seconds=3600,
     )
 
-    updated = service.set_item_ttl(item.id, 120, session_id=session_id)
+    updated = service.set_item_ttl(item.id, 120, session_id=SID)
     assert updated.pinned is False
     assert updated.expires_at is not None
 
 
-def test_delete_item_removes_file_and_manifest(tmp_path):
-    store = SessionStore(tmp_path)
-    repo = ManifestRepository(store, default_ttl_sec=3600)
-    service = SessionService(store, repo)
-    session_id = SessionId("sess_delete")
+def test_delete_item_removes_file_and_manifest(session_env):
+    store = session_env.store
+    repo = session_env.repo
+    service = session_env.service
 
-    target = store.transcripts_dir(session_id) / "delete.txt"
-    target.write_text("data", encoding="utf-8")
+    target = store.transcripts_dir(SID) / "delete.txt"
+    target.write_bytes(_DATA)
 
     item = repo.add_item(
-        session_id=session_id,
+        session_id=SID,
         kind=ItemKind.TRANSCRIPT,
         fmt=TranscriptFormat.TXT,
         relpath="transcripts/delete.txt",
@@ -61,37 +66,28 @@ def test_delete_item_removes_file_and_manifest(tmp_path):
         ttl_seconds=3600,
     )
 
-    assert service.delete_item(item.id, session_id=session_id) is True
+    assert service.delete_item(item.id, session_id=SID) is True
     assert not target.exists()
-    assert repo.list_items(session_id) == []
-
-
-def test_delete_item_handles_unlink_error_and_keeps_other_items(tmp_path, monkeypatch):
-    store = SessionStore(tmp_path)
-    repo = ManifestRepository(store, default_ttl_sec=3600)
-    service = SessionService(store, repo)
-    session_id = SessionId("sess_delete_error")
-
-    target = store.transcripts_dir(session_id) / "delete.txt"
-    target.write_text("data", encoding="utf-8")
-    other_target = store.transcripts_dir(session_id) / "keep.txt"
-    other_target.write_text("keep", encoding="utf-8")
-
-    item = repo.add_item(
-        session_id=session_id,
-        kind=ItemKind.TRANSCRIPT,
-        fmt=TranscriptFormat.TXT,
-        relpath="transcripts/delete.txt",
-        pinned=False,
-        ttl_seconds=3600,
-    )
-    other_item = repo.add_item(
-        session_id=session_id,
-        kind=ItemKind.TRANSCRIPT,
-        fmt=TranscriptFormat.TXT,
-        relpath="transcripts/keep.txt",
-        pinned=False,
-        ttl_seconds=3600,
+    assert repo.list_items(SID) == []
+
+
+def test_delete_item_handles_unlink_error_and_keeps_other_items(session_env):
+    store = session_env.store
+    repo = session_env.repo
+    service = session_env.service
+
+    tdir = store.transcripts_dir(SID)
+    target = tdir / "delete.txt"
+    target.write_bytes(_DATA)
+    other_target = tdir / "keep.txt"
+    other_target.write_bytes(_KEEP)
+
+    item, other_item = repo.add_items(
+        SID,
+        [
+            ItemSpec(ItemKind.TRANSCRIPT, TranscriptFormat.TXT, "transcripts/delete.txt", 3600),
+            ItemSpec(ItemKind.TRANSCRIPT, TranscriptFormat.TXT, "transcripts/keep.txt", 3600),
+        ],
     )
 
     real_unlink = Path.unlink
@@ -101,74 +97,63 @@ def test_delete_item_handles_unlink_error_and_keeps_other_items(tmp_path, monkey
             raise OSError("blocked")
         return real_unlink(self, *args, **kwargs)
 
-    monkeypatch.setattr(Path, "unlink", fake_unlink)
-
-    assert service.delete_item(item.id, session_id=session_id) is True
-    remaining = repo.list_items(session_id)
+    with mock.patch.object(Path, "unlink", autospec=True, side_effect=fake_unlink):
+        assert service.delete_item(item.id, session_id=SID) is True
+    remaining = repo.list_items(SID)
     assert len(remaining) == 1
     assert remaining[0].id == other_item.id
 
 
-def test_write_text_file_validates_relpath_and_overwrite(tmp_path):
-    store = SessionStore(tmp_path)
-    repo = ManifestRepository(store, default_ttl_sec=3600)
-    service = SessionService(store, repo)
-    session_id = SessionId("sess_write")
+@pytest.mark.parametrize("relpath", ["", "../bad.txt"])
+def test_write_text_file_validates_relpath(session_env, relpath):
+    with pytest.raises(ValueError, match="relpath"):
+        session_env.service.write_text_file(relpath=relpath, content="x", session_id=SID)
 
-    with pytest.raises(ValueError):
-        service.write_text_file(relpath="", content="x", session_id=session_id)
 
-    with pytest.raises(ValueError):
-        service.write_text_file(relpath="../bad.txt", content="x", session_id=session_id)
+def test_write_text_file_rejects_overwrite(session_env):
+    service = session_env.service
 
-    service.write_text_file(relpath="note.txt", content="x", session_id=session_id)
+    service.write_text_file(relpath="note.txt", content="x", session_id=SID)
     with pytest.raises(ValueError):
-        service.write_text_file(relpath="note.txt", content="x", session_id=session_id)
+        service.write_text_file(relpath="note.txt", content="x", session_id=SID)
 
 
-def test_write_text_file_rejects_symlink_escape(tmp_path):
-    store = SessionStore(tmp_path)
-    repo = ManifestRepository(store, default_ttl_sec=3600)
-    service = SessionService(store, repo)
-    session_id = SessionId("sess_symlink")
+@pytest.mark.skipif(sys.platform == "win32", reason="symlinks need elevated privileges")
+def test_write_text_file_rejects_symlink_escape(session_env, tmp_path):
+    store = session_env.store
+    service = session_env.service
 
-    outside = tmp_path / "outside"
-    outside.mkdir()
-
-    derived_root = store.derived_dir(session_id)
-    escape = derived_root / "escape"
-    escape.symlink_to(outside, target_is_directory=True)
+    escape = store.derived_path(SID, "escape")
+    escape.parent.mkdir(parents=True, exist_ok=True)
+    os.symlink(str(tmp_path / "outside"), str(escape), target_is_directory=True)
 
     with pytest.raises(ValueError):
-        service.write_text_file(relpath="escape/file.txt", content="x", session_id=session_id)
+        service.write_text_file(relpath="escape/file.txt", content="x", session_id=SID)
 
 
-def test_read_file_info_by_relpath(tmp_path):
-    store = SessionStore(tmp_path)
-    repo = ManifestRepository(store, default_ttl_sec=3600)
-    service = SessionService(store, repo)
-    session_id = SessionId("sess_info")
+def test_read_file_info_by_relpath(session_env):
+    store = session_env.store
+    service = session_env.service
 
-    target = store.transcripts_dir(session_id) / "manual.txt"
-    target.write_text("hello", encoding="utf-8")
+    target = store.transcripts_dir(SID) / "manual.txt"
+    target.write_bytes(_HELLO)
 
-    info = service.read_file_info(session_id=session_id, relpath="transcripts/manual.txt")
+    info = service.read_file_info(session_id=SID, relpath="transcripts/manual.txt")
     assert info.id is None
     assert info.relpath == "transcripts/manual.txt"
-    assert info.size == len("hello")
+    assert info.size == len(_HELLO)
 
 
-def test_read_file_info_by_relpath_matches_item(tmp_path):
-    store = SessionStore(tmp_path)
-    repo = ManifestRepository(store, default_ttl_sec=3600)
-    service = SessionService(store, repo)
-    session_id = SessionId("sess_info_match")
+def test_read_file_info_by_relpath_matches_item(session_env):
+    store = session_env.store
+    repo = session_env.repo
+    service = session_env.service
 
-    target = store.transcripts_dir(session_id) / "manual.txt"
-    target.write_text("hello", encoding="utf-8")
+    target = store.transcripts_dir(SID) / "manual.txt"
+    target.write_bytes(_HELLO)
 
     item = repo.add_item(
-        session_id=session_id,
+        session_id=SID,
         kind=ItemKind.TRANSCRIPT,
         fmt=TranscriptFormat.TXT,
         relpath="transcripts/manual.txt",
@@ -176,67 +161,53 @@ def test_read_file_info_by_relpath_matches_item(tmp_path):
         ttl_seconds=3600,
     )
 
-    info = service.read_file_info(session_id=session_id, relpath="transcripts/manual.txt")
+    info = service.read_file_info(session_id=SID, relpath="transcripts/manual.txt")
     assert info.id == item.id
 
 
-def test_read_file_info_not_found_item_id(tmp_path):
-    store = SessionStore(tmp_path)
-    repo = ManifestRepository(store, default_ttl_sec=3600)
-    service = SessionService(store, repo)
-    session_id = SessionId("sess_info_missing")
+def test_read_file_info_not_found_item_id(session_env):
+    service = session_env.service
 
     with pytest.raises(NotFoundError):
-        service.read_file_info(session_id=session_id, item_id="tr_missing")
-
+        service.read_file_info(session_id=SID, item_id="tr_missing")
 
-def test_read_file_chunk_validation_and_not_found(tmp_path):
-    store = SessionStore(tmp_path)
-    repo = ManifestRepository(store, default_ttl_sec=3600)
-    service = SessionService(store, repo)
-    session_id = SessionId("sess_chunk")
 
-    with pytest.raises(ValueError):
-        service.read_file_chunk(session_id=session_id, relpath="transcripts/a.txt", max_bytes=0)
-
-    with pytest.raises(ValueError):
-        service.read_file_chunk(session_id=session_id, relpath="transcripts/a.txt", offset=-1)
-
-    with pytest.raises(NotFoundError):
-        service.read_file_chunk(session_id=session_id, item_id="tr_missing")
+@pytest.mark.parametrize(
+    "kwargs,exc,match",
+    [
+        ({"relpath": "transcripts/a.txt", "max_bytes": 0}, ValueError, "max_bytes"),
+        ({"relpath": "transcripts/a.txt", "offset": -1}, ValueError, "offset"),
+        ({"item_id": "tr_missing"}, NotFoundError, "Item not found"),
+    ],
+)
+def test_read_file_chunk_rejects_invalid_requests(session_env, kwargs, exc, match):
+    with pytest.raises(exc, match=match):
+        session_env.service.read_file_chunk(session_id=SID, **kwargs)
 
 
-def test_read_file_chunk_requires_reference(tmp_path):
-    store = SessionStore(tmp_path)
-    repo = ManifestRepository(store, default_ttl_sec=3600)
-    service = SessionService(store, repo)
-    session_id = SessionId("sess_chunk_required")
+def test_read_file_chunk_requires_reference(session_env):
+    service = session_env.service
 
     with pytest.raises(ValueError):
-        service.read_file_chunk(session_id=session_id)
+        service.read_file_chunk(session_id=SID)
 
 
-def test_read_file_chunk_missing_file_raises(tmp_path):
-    store = SessionStore(tmp_path)
-    repo = ManifestRepository(store, default_ttl_sec=3600)
-    service = SessionService(store, repo)
-    session_id = SessionId("sess_chunk_missing")
+def test_read_file_chunk_missing_file_raises(session_env):
+    service = session_env.service
 
     with pytest.raises(ValueError):
-        service.read_file_chunk(session_id=session_id, relpath="transcripts/missing.txt")
+        service.read_file_chunk(session_id=SID, relpath="transcripts/missing.txt")
 
 
-def test_read_file_chunk_eof_when_offset_past_size(tmp_path):
-    store = SessionStore(tmp_path)
-    repo = ManifestRepository(store, default_ttl_sec=3600)
-    service = SessionService(store, repo)
-    session_id = SessionId("sess_eof")
+def test_read_file_chunk_eof_when_offset_past_size(session_env):
+    store = session_env.store
+    service = session_env.service
 
-    target = store.transcripts_dir(session_id) / "small.txt"
-    target.write_text("data", encoding="utf-8")
+    target = store.transcripts_dir(SID) / "small.txt"
+    target.write_bytes(_DATA)
 
     chunk = service.read_file_chunk(
-        session_id=session_id,
+        session_id=SID,
         relpath="transcripts/small.txt",
         offset=10,
         max_bytes=5,
@@ -245,36 +216,27 @@ def test_read_file_chunk_eof_when_offset_past_size(tmp_path):
     assert chunk.data == ""
 
 
-def test_update_item_handles_missing_and_other_items(tmp_path):
-    store = SessionStore(tmp_path)
-    repo = ManifestRepository(store, default_ttl_sec=3600)
-    service = SessionService(store, repo)
-    session_id = SessionId("sess_update")
+def test_update_item_handles_missing_and_other_items(session_env):
+    store = session_env.store
+    repo = session_env.repo
+    service = session_env.service
 
-    first_path = store.transcripts_dir(session_id) / "first.txt"
-    first_path.write_text("one", encoding="utf-8")
-    second_path = store.transcripts_dir(session_id) / "second.txt"
-    second_path.write_text("two", encoding="utf-8")
+    tdir = store.transcripts_dir(SID)
+    first_path = tdir / "first.txt"
+    first_path.write_bytes(_ONE)
+    second_path = tdir / "second.txt"
+    second_path.write_bytes(_TWO)
 
-    first = repo.add_item(
-        session_id=session_id,
-        kind=ItemKind.TRANSCRIPT,
-        fmt=TranscriptFormat.TXT,
-        relpath="transcripts/first.txt",
-        pinned=False,
-        ttl_seconds=3600,
-    )
-    repo.add_item(
-        session_id=session_id,
-        kind=ItemKind.TRANSCRIPT,
-        fmt=TranscriptFormat.TXT,
-        relpath="transcripts/second.txt",
-        pinned=False,
-        ttl_seconds=3600,
+    first, _ = repo.add_items(
+        SID,
+        [
+            ItemSpec(ItemKind.TRANSCRIPT, TranscriptFormat.TXT, "transcripts/first.txt", 3600),
+            ItemSpec(ItemKind.TRANSCRIPT, TranscriptFormat.TXT, "transcripts/second.txt", 3600),
+        ],
     )
 
-    pinned = service.pin_item(first.id, session_id=session_id)
+    pinned = service.pin_item(first.id, session_id=SID)
     assert pinned.pinned is True
 
     with pytest.raises(NotFoundError):
-        service.pin_item("tr_missing", session_id=session_id)
+        service.pin_item("tr_missing", session_id=SID)
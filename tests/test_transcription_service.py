@@ -1,79 +1,48 @@
 import pytest
 
-from adapters.filesystem_store import SessionStore
-from adapters.manifest_json_repo import ManifestRepository
-from adapters.ytdlp_client import YtDlpSubtitles
 from domain.models import ItemKind, TranscriptFormat
 from domain.types import SessionId
-from services.transcription_service import (
-    JsonlWriter,
-    TranscriptParser,
-    TranscriptionService,
-    VttWriter,
-)
-
+from services.transcription_service import TranscriptionService
 
-class FakeYtDlpClient:
-    def __init__(self, vtt_text: str, info: dict | None = None) -> None:
-        self._vtt_text = vtt_text
-        self._info = info or {}
 
-    def get_info(self, url: str) -> dict:
-        return self._info
+SID = SessionId("sess_test")
+_VTT_ONE_LINE = "WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nHello world\n"
+_VTT_EMPTY = "WEBVTT\n\n"
 
-    def get_subtitles(self, url: str) -> YtDlpSubtitles:
-        return YtDlpSubtitles(vtt_text=self._vtt_text, stdout="", picked_file="test.vtt")
 
-
-def test_transcribe_auto_returns_text_when_small(tmp_path):
-    vtt_text = "WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nHello world\n"
-    client = FakeYtDlpClient(vtt_text)
-    store = SessionStore(tmp_path)
-    repo = ManifestRepository(store, default_ttl_sec=3600)
-    service = TranscriptionService(client, TranscriptParser(), store, repo)
-    session_id = SessionId("sess_auto")
+@pytest.mark.parametrize("fake_client", [_VTT_ONE_LINE], indirect=True)
+@pytest.mark.parametrize("max_bytes,expected_kind", [(100, "text"), (1, "file")])
+def test_transcribe_auto_picks_text_or_file(
+    session_env, parser, fake_client, max_bytes, expected_kind
+):
+    store = session_env.store
+    service = TranscriptionService(fake_client, parser, store, session_env.repo)
 
     result = service.transcribe_auto(
         url="https://youtube.com/watch?v=abc",
         fmt=TranscriptFormat.TXT,
-        max_text_bytes=100,
-        session_id=session_id,
+        max_text_bytes=max_bytes,
+        session_id=SID,
     )
 
-    assert result.kind == "text"
-    assert result.text == "Hello world"
-    assert result.item is None
-
+    assert result.kind == expected_kind
+    if expected_kind == "text":
+        assert result.text == "Hello world"
+        assert result.item is None
+        return
 
-def test_transcribe_auto_returns_file_when_large(tmp_path):
-    vtt_text = "WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nHello world\n"
-    client = FakeYtDlpClient(vtt_text)
-    store = SessionStore(tmp_path)
-    repo = ManifestRepository(store, default_ttl_sec=3600)
-    service = TranscriptionService(client, TranscriptParser(), store, repo)
-    session_id = SessionId("sess_auto")
-
-    result = service.transcribe_auto(
-        url="https://youtube.com/watch?v=abc",
-        fmt=TranscriptFormat.TXT,
-        max_text_bytes=1,
-        session_id=session_id,
-    )
-
-    assert result.kind == "file"
     assert result.text is None
     assert result.item is not None
     assert result.item.kind is ItemKind.TRANSCRIPT
     assert result.item.format == TranscriptFormat.TXT.value
 
-    path = store.resolve_relpath(session_id, result.item.relpath)
+    path = store.resolve_relpath(SID, result.item.relpath)
     assert path.exists()
     assert path.suffix == ".txt"
     assert path.read_text(encoding="utf-8") == "Hello world\n"
 
 
-def test_transcript_parser_dedupe_and_windowing():
-    parser = TranscriptParser()
+def test_transcript_parser_dedupe_and_windowing(parser):
     lines = ["hello", "hello", "world", "hello"]
     deduped = parser.dedupe_lines(lines, window=2)
     assert deduped == ["hello", "world"]
@@ -82,43 +51,36 @@ def test_transcript_parser_dedupe_and_windowing():
     assert windowed == ["a", "b", "c"]
 
 
-def test_transcribe_to_text_raises_on_empty(tmp_path):
-    client = FakeYtDlpClient("WEBVTT\n\n")
-    store = SessionStore(tmp_path)
-    repo = ManifestRepository(store, default_ttl_sec=3600)
-    service = TranscriptionService(client, TranscriptParser(), store, repo)
+@pytest.mark.parametrize("fake_client", [_VTT_EMPTY], indirect=True)
+def test_transcribe_to_text_raises_on_empty(session_env, parser, fake_client):
+    service = TranscriptionService(fake_client, parser, session_env.store, session_env.repo)
 
     with pytest.raises(RuntimeError):
         service.transcribe_to_text("https://youtube.com/watch?v=abc")
 
 
-def test_transcribe_to_file_raises_on_empty(tmp_path):
-    client = FakeYtDlpClient("WEBVTT\n\n")
-    store = SessionStore(tmp_path)
-    repo = ManifestRepository(store, default_ttl_sec=3600)
-    service = TranscriptionService(client, TranscriptParser(), store, repo)
-    session_id = SessionId("sess_empty")
+@pytest.mark.parametrize("fake_client", [_VTT_EMPTY], indirect=True)
+def test_transcribe_to_file_raises_on_empty(session_env, parser, fake_client):
+    service = TranscriptionService(fake_client, parser, session_env.store, session_env.repo)
 
     with pytest.raises(RuntimeError):
         service.transcribe_to_file(
             url="https://youtube.com/watch?v=abc",
             fmt=TranscriptFormat.TXT,
-            session_id=session_id,
+            session_id=SID,
         )
 
 
-def test_transcribe_auto_validates_inputs(tmp_path):
-    client = FakeYtDlpClient("WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nHello\n")
-    store = SessionStore(tmp_path)
-    repo = ManifestRepository(store, default_ttl_sec=3600)
-    service = TranscriptionService(client, TranscriptParser(), store, repo)
+@pytest.mark.parametrize("fake_client", [_VTT_ONE_LINE], indirect=True)
+def test_transcribe_auto_validates_inputs(session_env, parser, fake_client):
+    service = TranscriptionService(fake_client, parser, session_env.store, session_env.repo)
 
     with pytest.raises(ValueError):
         service.transcribe_auto(
             url="https://youtube.com/watch?v=abc",
             fmt=TranscriptFormat.TXT,
             max_text_bytes=0,
-            session_id=SessionId("sess_auto"),
+            session_id=SID,
         )
 
     with pytest.raises(ValueError):
@@ -130,39 +92,35 @@ def test_transcribe_auto_validates_inputs(tmp_path):
         )
 
 
-def test_transcribe_to_file_requires_writer(tmp_path):
-    client = FakeYtDlpClient("WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nHello\n")
-    store = SessionStore(tmp_path)
-    repo = ManifestRepository(store, default_ttl_sec=3600)
+@pytest.mark.parametrize("fake_client", [_VTT_ONE_LINE], indirect=True)
+def test_transcribe_to_file_requires_writer(session_env, parser, vtt_writer, fake_client):
     service = TranscriptionService(
-        client,
-        TranscriptParser(),
-        store,
-        repo,
-        writers={TranscriptFormat.VTT: VttWriter()},
+        fake_client,
+        parser,
+        session_env.store,
+        session_env.repo,
+        writers={TranscriptFormat.VTT: vtt_writer},
     )
-    session_id = SessionId("sess_writer")
 
     with pytest.raises(ValueError):
         service.transcribe_to_file(
             url="https://youtube.com/watch?v=abc",
             fmt=TranscriptFormat.TXT,
-            session_id=session_id,
+            session_id=SID,
         )
 
 
-def test_writers_create_files(tmp_path):
-    base = tmp_path / "out"
-    transcript = "line1\nline2"
-    vtt_text = "WEBVTT\n\nHello"
-
-    vtt_path = VttWriter().write(base, transcript, vtt_text)
-    assert vtt_path.suffix == ".vtt"
-    assert vtt_path.read_text(encoding="utf-8") == vtt_text
+@pytest.mark.parametrize(
+    "writer,suffix,expected",
+    [
+        ("vtt_writer", ".vtt", "WEBVTT\n\nHello"),
+        ("jsonl_writer", ".jsonl", '{"text": "line1"}\n{"text": "line2"}\n'),
+    ],
+)
+def test_writers_create_files(request, tmp_path, writer, suffix, expected):
+    path = request.getfixturevalue(writer).write(
+        tmp_path / "out", "line1\nline2", "WEBVTT\n\nHello"
+    )
 
-    jsonl_path = JsonlWriter().write(base, transcript, vtt_text)
-    assert jsonl_path.suffix == ".jsonl"
-    assert jsonl_path.read_text(encoding="utf-8").splitlines() == [
-        '{"text": "line1"}',
-        '{"text": "line2"}',
-    ]
+    assert path.suffix == suffix
+    assert path.read_text(encoding="utf-8") == expected
@@ -1,14 +1,24 @@
+import json
+import threading
+import time
+import traceback
+import types
 from contextlib import contextmanager
 from pathlib import Path
 from subprocess import CompletedProcess
+from unittest import mock
 
 import pytest
 
+import adapters.ytdlp_client as ytdlp_client
 from adapters.ytdlp_client import YtDlpClient
 from config import AppConfig
 from domain.errors import ExternalCommandError
 
 
+_URL = "https://youtu.be/"
+
+
 def test_ytdlp_client_get_info_parses_json():
     env = {
         "YTDLP_BIN": "/bin/yt-dlp",
@@ -36,6 +46,36 @@ def test_ytdlp_client_get_info_parses_json():
     assert "youtube:player_client=web" in captured["cmd"]
 
 
+def test_ytdlp_client_get_info_reads_bytes_stdout():
+    config = AppConfig.from_env({"YTDLP_TIMEOUT_SEC": "5"})
+    captured = {}
+
+    def fake_run(cmd, **kwargs):
+        captured.update(kwargs)
+        if cmd[-1].endswith("bad"):
+            return CompletedProcess(cmd, 1, stdout="ERROR: caf\u00e9 \xff".encode("latin-1"))
+        return CompletedProcess(cmd, 0, stdout='[info]\n{"title": "caf\u00e9"}\n'.encode("utf-8"))
+
+    client = YtDlpClient(config, runner=fake_run)
+
+    assert client.get_info(_URL + "ok") == {"title": "caf\u00e9"}
+    assert captured["text"] is False
+    with pytest.raises(ExternalCommandError) as exc:
+        client.get_info(_URL + "bad")
+    assert exc.value.output.startswith("ERROR: caf")
+
+
+def test_ytdlp_clients_share_argv_prefixes_per_config():
+    config = AppConfig.from_env({"YTDLP_BIN": "/bin/yt-dlp"})
+
+    first = YtDlpClient(config)
+    second = YtDlpClient(AppConfig.from_env({"YTDLP_BIN": "/bin/yt-dlp"}))
+
+    assert first._info_argv_prefix is second._info_argv_prefix
+    assert first._subs_argv_prefix is second._subs_argv_prefix
+    assert first._info_argv_prefix[0] == "/bin/yt-dlp"
+
+
 def test_ytdlp_client_raises_on_failure():
     config = AppConfig.from_env({"YTDLP_TIMEOUT_SEC": "5"})
 
@@ -78,6 +118,284 @@ def test_ytdlp_client_info_cache_respects_ttl():
     assert calls["count"] == 2
 
 
+def test_ytdlp_client_info_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(ytdlp_client, "_INFO_CACHE_MAX_ENTRIES", 2)
+    config = AppConfig.from_env({"YTDLP_TIMEOUT_SEC": "5"})
+    fetched = []
+
+    def fake_run(cmd, **kwargs):
+        fetched.append(cmd[-1].removeprefix(_URL))
+        return CompletedProcess(cmd, 0, stdout='{"title": "t"}\n')
+
+    client = YtDlpClient(config, runner=fake_run, cache_ttl_sec=60, time_provider=lambda: 0.0)
+
+    client.get_info(_URL + "a")
+    client.get_info(_URL + "b")
+    client.get_info(_URL + "a")
+    client.get_info(_URL + "c")
+    client.get_info(_URL + "a")
+    client.get_info(_URL + "b")
+
+    assert fetched == ["a", "b", "c", "b"]
+
+
+def test_ytdlp_client_info_cache_drops_expired_entries_on_store():
+    config = AppConfig.from_env({"YTDLP_TIMEOUT_SEC": "5"})
+    clock = {"now": 0.0}
+
+    def fake_run(cmd, **kwargs):
+        return CompletedProcess(cmd, 0, stdout='{"title": "t"}\n')
+
+    client = YtDlpClient(
+        config, runner=fake_run, cache_ttl_sec=60, time_provider=lambda: clock["now"]
+    )
+
+    client.get_info(_URL + "a")
+    client.get_info(_URL + "b")
+    clock["now"] = 61.0
+    client.get_info(_URL + "c")
+
+    assert list(client._info_cache) == [_URL + "c"]
+
+
+def test_ytdlp_client_info_caches_failures_briefly():
+    config = AppConfig.from_env({"YTDLP_TIMEOUT_SEC": "5"})
+    clock = {"now": 0.0}
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd[-1])
+        return CompletedProcess(cmd, 1, stdout="ERROR: Private video")
+
+    client = YtDlpClient(
+        config, runner=fake_run, cache_ttl_sec=300, time_provider=lambda: clock["now"]
+    )
+
+    for _ in range(3):
+        with pytest.raises(ExternalCommandError, match="Private video"):
+            client.get_info(_URL + "private")
+    assert len(calls) == 1
+
+    clock["now"] = 31.0
+    with pytest.raises(ExternalCommandError):
+        client.get_info(_URL + "private")
+    assert len(calls) == 2
+
+
+def test_ytdlp_client_negative_cache_raises_fresh_errors():
+    def fake_run(cmd, **kwargs):
+        return CompletedProcess(cmd, 1, stdout="ERROR: Private video")
+
+    client = YtDlpClient(AppConfig.from_env({}), runner=fake_run, cache_ttl_sec=300)
+
+    raised = []
+    for _ in range(3):
+        with pytest.raises(ExternalCommandError) as excinfo:
+            client.get_info(_URL + "private")
+        raised.append(excinfo.value)
+
+    assert raised[1] is not raised[2]
+    assert raised[1].returncode == raised[2].returncode == 1
+    assert str(raised[1]) == str(raised[2]) == str(raised[0])
+    depths = [len(traceback.extract_tb(exc.__traceback__)) for exc in raised[1:]]
+    assert depths[0] == depths[1]
+
+
+def test_ytdlp_client_rechecks_failures_before_leading_fetch():
+    runner = mock.Mock()
+    client = YtDlpClient(AppConfig.from_env({}), runner=runner, cache_ttl_sec=300)
+    client._store_failure(_URL + "private", ExternalCommandError("yt-dlp failed", returncode=1))
+
+    # Simulate a leader storing its failure between the unlocked miss and registration.
+    with mock.patch.object(client, "_cached_failure", return_value=None):
+        with pytest.raises(ExternalCommandError, match="yt-dlp failed"):
+            client.get_info(_URL + "private")
+
+    runner.assert_not_called()
+    assert client._inflight == {}
+
+
+@pytest.mark.parametrize("cache_ttl_sec", [0, 60])
+def test_ytdlp_client_get_info_many_empty_skips_ytdlp(cache_ttl_sec):
+    runner = mock.Mock()
+    client = YtDlpClient(AppConfig.from_env({}), runner=runner, cache_ttl_sec=cache_ttl_sec)
+
+    assert client.get_info_many([]) == []
+    runner.assert_not_called()
+
+
+class _CountingEvent(threading.Event):
+    def __init__(self, waiters):
+        super().__init__()
+        self._waiters = waiters
+
+    def wait(self, timeout=None):
+        self._waiters.append(threading.current_thread())
+        return super().wait(timeout)
+
+
+class _BlockedLeader:
+    """Holds the first yt-dlp run open until the expected callers wait on it."""
+
+    def __init__(self, *results):
+        self.calls = []
+        self.waiters = []
+        self._results = results
+        self._started = threading.Event()
+        self._release = threading.Event()
+
+    def event_factory(self):
+        return _CountingEvent(self.waiters)
+
+    def run(self, cmd, **kwargs):
+        self.calls.append(cmd)
+        returncode, stdout = self._results[min(len(self.calls), len(self._results)) - 1]
+        if len(self.calls) == 1:
+            self._started.set()
+            self._release.wait(timeout=5)
+        return CompletedProcess(cmd, returncode, stdout=stdout)
+
+    def drive(self, leader, *followers):
+        threads = [threading.Thread(target=fn) for fn in (leader, *followers)]
+        threads[0].start()
+        assert self._started.wait(timeout=5)
+        for thread in threads[1:]:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while len(self.waiters) < len(followers) and time.monotonic() < deadline:
+            time.sleep(0.001)
+        assert len(self.waiters) == len(followers)
+        self._release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+        assert not any(thread.is_alive() for thread in threads)
+
+
+def test_ytdlp_client_info_coalesces_concurrent_fetches():
+    config = AppConfig.from_env({"YTDLP_TIMEOUT_SEC": "5"})
+    harness = _BlockedLeader((0, '{"title": "shared"}\n'))
+    client = YtDlpClient(
+        config, runner=harness.run, cache_ttl_sec=60, event_factory=harness.event_factory
+    )
+    results = []
+
+    def fetch():
+        results.append(client.get_info("https://youtube.com/watch?v=abc"))
+
+    harness.drive(fetch, fetch, fetch, fetch)
+
+    assert len(harness.calls) == 1
+    assert results == [{"title": "shared"}] * 4
+
+
+def test_ytdlp_client_info_retries_failed_batch_through_cache():
+    config = AppConfig.from_env({"YTDLP_TIMEOUT_SEC": "5"})
+    harness = _BlockedLeader((1, "boom"), (0, '{"title": "retried"}\n'))
+    client = YtDlpClient(
+        config, runner=harness.run, cache_ttl_sec=60, event_factory=harness.event_factory
+    )
+    errors = []
+    results = []
+
+    def fetch_batch():
+        try:
+            client.get_info_many([_URL + "a", _URL + "b"])
+        except ExternalCommandError as exc:
+            errors.append(exc)
+
+    def fetch_one():
+        results.append(client.get_info(_URL + "a"))
+
+    harness.drive(fetch_batch, fetch_one)
+
+    assert len(errors) == 1
+    assert results == [{"title": "retried"}]
+    assert client.get_info(_URL + "a") == {"title": "retried"}
+    assert len(harness.calls) == 2
+    assert harness.calls[1][-1] == _URL + "a"
+
+
+def test_select_loads_prefers_orjson_then_stdlib():
+    fake_orjson = types.SimpleNamespace(loads=mock.Mock())
+
+    assert ytdlp_client._select_loads(fake_orjson, object()) is fake_orjson.loads
+    assert ytdlp_client._select_loads(None, None) is json.loads
+
+
+def test_simdjson_fallback_reuses_one_parser_per_thread():
+    created = []
+
+    class FakeParser:
+        def __init__(self):
+            created.append(self)
+
+        def parse(self, data, recursive=False):
+            assert recursive is True
+            return json.loads(data)
+
+    loads = ytdlp_client._select_loads(None, types.SimpleNamespace(Parser=FakeParser))
+
+    assert loads('{"a": 1}') == {"a": 1}
+    assert loads('{"b": 2}') == {"b": 2}
+    assert len(created) == 1
+
+    def parse_twice():
+        loads('{"c": 3}')
+        loads('{"d": 4}')
+
+    thread = threading.Thread(target=parse_twice)
+    thread.start()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert len(created) == 2
+
+
+def test_ytdlp_client_get_info_many_batches_uncached_urls():
+    config = AppConfig.from_env({"YTDLP_TIMEOUT_SEC": "5"})
+    runs = []
+
+    def fake_run(cmd, **kwargs):
+        urls = cmd[cmd.index("--dump-json") + 1 :]
+        runs.append(urls)
+        docs = "\n".join(json.dumps({"id": url.removeprefix(_URL)}) for url in urls)
+        return CompletedProcess(cmd, 0, stdout=f"[youtube] extracting\n{docs}\n")
+
+    client = YtDlpClient(config, runner=fake_run, cache_ttl_sec=60)
+
+    assert client.get_info(_URL + "a") == {"id": "a"}
+    infos = client.get_info_many([_URL + "b", _URL + "a", _URL + "c", _URL + "b"])
+
+    assert [info["id"] for info in infos] == ["b", "a", "c", "b"]
+    assert runs == [[_URL + "a"], [_URL + "b", _URL + "c"]]
+
+
+def test_ytdlp_client_get_info_many_requires_one_document_per_url():
+    config = AppConfig.from_env({"YTDLP_TIMEOUT_SEC": "5"})
+
+    def fake_run(cmd, **kwargs):
+        return CompletedProcess(cmd, 0, stdout='{"id": "a"}\n')
+
+    client = YtDlpClient(config, runner=fake_run)
+
+    with pytest.raises(ExternalCommandError):
+        client.get_info_many([_URL + "a", _URL + "b"])
+
+
+def test_ytdlp_client_rejects_non_youtube_urls_without_running():
+    config = AppConfig.from_env({"YTDLP_TIMEOUT_SEC": "5"})
+
+    def fake_run(cmd, **kwargs):
+        raise AssertionError("yt-dlp should not run")
+
+    client = YtDlpClient(config, runner=fake_run)
+
+    with pytest.raises(ValueError, match="valid YouTube video URL"):
+        client.get_info("https://example.com/video")
+    with pytest.raises(ValueError, match="valid YouTube video URL"):
+        client.get_subtitles("not a url")
+
+
 def test_ytdlp_client_get_info_missing_json_raises():
     config = AppConfig.from_env({"YTDLP_TIMEOUT_SEC": "5"})
 
@@ -90,6 +408,21 @@ def test_ytdlp_client_get_info_missing_json_raises():
         client.get_info("https://youtube.com/watch?v=abc")
 
 
+def test_ytdlp_client_get_info_picks_last_complete_json_line():
+    config = AppConfig.from_env({"YTDLP_TIMEOUT_SEC": "5"})
+
+    def fake_run(cmd, **kwargs):
+        return CompletedProcess(
+            cmd,
+            0,
+            stdout='{"title": "first"}\n{"title": "second"}\n{truncated\nWARNING: done\n',
+        )
+
+    client = YtDlpClient(config, runner=fake_run)
+
+    assert client.get_info("https://youtube.com/watch?v=abc") == {"title": "second"}
+
+
 def test_ytdlp_client_get_info_invalid_json_raises():
     config = AppConfig.from_env({"YTDLP_TIMEOUT_SEC": "5"})
 
@@ -120,6 +453,28 @@ def test_ytdlp_client_get_subtitles_success():
     assert "--write-auto-subs" in captured["cmd"]
 
 
+@pytest.mark.parametrize(
+    "names,expected",
+    [
+        (["video.de.vtt", "video.en.vtt", "video.zz.vtt"], "video.en.vtt"),
+        (["a.de.vtt", "b.fr.vtt"], "b.fr.vtt"),
+    ],
+)
+def test_ytdlp_client_get_subtitles_prefers_english_then_last_name(names, expected):
+    config = AppConfig.from_env({"YTDLP_TIMEOUT_SEC": "5"})
+
+    def fake_run(cmd, **kwargs):
+        workdir = Path(kwargs["cwd"])
+        for name in names:
+            (workdir / name).write_text("WEBVTT\n\nHello", encoding="utf-8")
+        (workdir / "video.info.json").write_text("{}", encoding="utf-8")
+        return CompletedProcess(cmd, 0, stdout="ok")
+
+    client = YtDlpClient(config, runner=fake_run)
+
+    assert client.get_subtitles("https://youtube.com/watch?v=abc").picked_file == expected
+
+
 def test_ytdlp_client_get_subtitles_nonzero_with_files():
     config = AppConfig.from_env({"YTDLP_TIMEOUT_SEC": "5"})
 